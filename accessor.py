@@ -0,0 +1,102 @@
+"""
+pandas accessor evaluating DataFrames of contract seasons, shaped like
+Contract.to_df output with one row per contract season.
+
+    import accessor  # registers df.qbce
+
+    evaluated = df.qbce.evaluate(production_col="prod", group_col="player")
+
+All contracts are evaluated in one vectorized batch.evaluate_batch call, with
+results identical to building and evaluating a ContractEvaluation per group.
+"""
+
+import numpy as np
+import pandas as pd
+from batch import evaluate_batch
+from table import ContractTable
+
+
+@pd.api.extensions.register_dataframe_accessor("qbce")
+class EvaluationAccessor:
+    """
+    df.qbce: rows are contract seasons with the columns of
+    ContractSeason.to_dict, and group_col (if any) labels each row's contract
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+
+    def contract_codes(self, group_col: str = None) -> np.ndarray:
+        """Get the contract number of every row, in order of first appearance"""
+        if group_col is None:
+            return np.zeros(len(self.df), dtype=np.int64)
+        codes, _ = pd.factorize(self.df[group_col], use_na_sentinel=False)
+        return codes.astype(np.int64)
+
+    def season_order(self, codes: np.ndarray) -> np.ndarray:
+        """Get the row positions ordered by contract, then by season"""
+        years = self.df["year"].to_numpy()
+        return np.lexsort((years, codes))
+
+    def to_table(self, group_col: str = None) -> ContractTable:
+        """Build a ContractTable of the contracts, in order of first appearance"""
+        codes = self.contract_codes(group_col)
+        order = self.season_order(codes)
+        return self.build_table(codes, order)
+
+    def build_table(self, codes: np.ndarray, order: np.ndarray) -> ContractTable:
+        df = self.df
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes))])
+        columns = {}
+        for name, dtype in ContractTable.COLUMNS.items():
+            col = df[name] if name in df else pd.Series(np.nan, index=df.index)
+            if dtype is np.bool_:
+                col = col.fillna(False).astype(bool)
+            else:
+                col = pd.to_numeric(col).astype(float)
+            columns[name] = col.to_numpy()[order]
+        return ContractTable(offsets, columns)
+
+    def evaluate(
+        self,
+        production_col: str = "prod",
+        group_col: str = None,
+        prod_function="6_poly",
+        base_year: int = None,
+        inflation_rate: float = None,
+    ) -> pd.DataFrame:
+        """
+        Evaluate every contract against the productions in production_col,
+        where the rows of each group_col value (or else all rows) are one
+        contract.  Returns a copy of the DataFrame with the inflation_adj,
+        market_salary, actual_salary, surplus_value and is_option_tendered
+        columns of each season's evaluation
+        """
+        df = self.df
+        codes = self.contract_codes(group_col)
+        order = self.season_order(codes)
+        table = self.build_table(codes, order)
+        productions = pd.to_numeric(df[production_col]).to_numpy(dtype=float)
+        result = evaluate_batch(
+            **table.to_batch(),
+            productions=table.pad(productions[order]),
+            prod_function=prod_function,
+            base_year=base_year,
+            inflation_rate=inflation_rate,
+        )
+
+        # Scatter each contract's seasons back to their rows
+        rows = codes[order]
+        cols = np.arange(len(df)) - table.offsets[rows]
+        evaluated = df.copy()
+        for name, values in (
+            ("inflation_adj", result.inflation_adj),
+            ("market_salary", result.market_salary),
+            ("actual_salary", result.actual_salary),
+            ("surplus_value", result.season_surplus_value),
+            ("is_option_tendered", result.is_option_tendered),
+        ):
+            col = np.empty(len(df), dtype=values.dtype)
+            col[order] = np.broadcast_to(values, result.market_salary.shape)[rows, cols]
+            evaluated[name] = col
+        return evaluated
@@ -0,0 +1,238 @@
+import numpy as np
+from value import (
+    market_value as eval_market_value,
+    get_apy_prod_value_6_poly,
+    get_model,
+)
+from store import load_arrays, save_arrays
+
+
+class BatchEvaluation:
+    """
+    Result of evaluating many contracts at once.  Aggregates have the
+    leading (contract) shape of the inputs, per-season matrices have the
+    full (contract x season) shape with NaN in padded seasons
+    """
+
+    surplus_value: np.ndarray
+    market_value: np.ndarray
+    total_value: np.ndarray
+
+    production: np.ndarray
+    inflation_adj: np.ndarray
+    market_salary: np.ndarray
+    actual_salary: np.ndarray
+    season_surplus_value: np.ndarray
+    is_option_tendered: np.ndarray
+
+    def __init__(
+        self,
+        production,
+        inflation_adj,
+        market_salary,
+        actual_salary,
+        season_surplus_value,
+        is_option_tendered,
+        valid,
+    ) -> None:
+        self.production = production
+        self.inflation_adj = inflation_adj
+        self.market_salary = market_salary
+        self.actual_salary = actual_salary
+        self.season_surplus_value = season_surplus_value
+        self.is_option_tendered = is_option_tendered
+        self.surplus_value = season_sum(season_surplus_value, valid)
+        self.market_value = season_sum(market_salary, valid)
+        self.total_value = season_sum(actual_salary, valid)
+
+    def __len__(self) -> int:
+        return len(self.surplus_value)
+
+    def __repr__(self) -> str:
+        return f"BatchEvaluation({self.season_surplus_value.shape})"
+
+    ARRAYS = (
+        "surplus_value",
+        "market_value",
+        "total_value",
+        "production",
+        "inflation_adj",
+        "market_salary",
+        "actual_salary",
+        "season_surplus_value",
+        "is_option_tendered",
+    )
+
+    def save(self, path: str) -> None:
+        """Save every aggregate and per-season array to a directory of columns"""
+        save_arrays(path, {name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = "r"):
+        """
+        Load an evaluation saved by save, memory-mapped unless mmap_mode is
+        None, without re-evaluating
+        """
+        arrays, _ = load_arrays(path, mmap_mode)
+        evaluation = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(evaluation, name, arrays[name])
+        return evaluation
+
+
+def season_sum(season_vals, valid):
+    """
+    Sum per-season values over valid seasons in season order, matching the
+    accumulation order (and so the rounding) of ContractEvaluation.evaluate
+    """
+    season_vals = np.where(valid, season_vals, 0.0)
+    if season_vals.shape[-1] == 0:
+        return season_vals.sum(axis=-1)
+    return np.cumsum(season_vals, axis=-1)[..., -1]
+
+
+def remaining_values(market_salaries, salaries, option_salaries, void_dead_caps):
+    """
+    Value of the remainder of each contract from every season onward, as
+    computed by ContractEvaluation.get_remaining_vals, via a reverse suffix sum
+    """
+    is_option_year = ~np.isnan(option_salaries)
+    is_void_year = ~np.isnan(void_dead_caps)
+    season_vals = np.where(
+        is_void_year,
+        -void_dead_caps,
+        market_salaries - np.where(is_option_year, option_salaries, salaries),
+    )
+    season_vals = np.nan_to_num(season_vals)
+    return np.flip(np.cumsum(np.flip(season_vals, axis=-1), axis=-1), axis=-1)
+
+
+def evaluate_batch(
+    years,
+    salaries,
+    productions,
+    option_salaries=np.nan,
+    option_dead_caps=np.nan,
+    void_dead_caps=np.nan,
+    prod_function=get_apy_prod_value_6_poly,
+    base_year=None,
+    inflation_rate=None,
+) -> BatchEvaluation:
+    """
+    Evaluate N contracts x M seasons in a single vectorized pass.
+
+    All inputs broadcast against each other, with seasons along the last
+    axis.  Option and void seasons are marked by a non-NaN option salary or
+    void dead cap respectively, and padded seasons by a NaN year.  Results are
+    identical to ContractEvaluation.evaluate on each contract.  base_year and
+    inflation_rate are passed to market_value and may also be arrays, e.g.
+    to evaluate a grid of inflation scenarios at once
+    """
+    prod_function = get_model(prod_function)
+    years, salaries, productions, option_salaries, option_dead_caps, void_dead_caps = (
+        np.broadcast_arrays(
+            *(
+                np.asarray(arr, dtype=float)
+                for arr in (
+                    years,
+                    salaries,
+                    productions,
+                    option_salaries,
+                    option_dead_caps,
+                    void_dead_caps,
+                )
+            )
+        )
+    )
+    valid = ~np.isnan(years)
+    is_option_year = ~np.isnan(option_salaries) & valid
+    is_void_year = ~np.isnan(void_dead_caps) & valid
+
+    # Get contract values
+    market_salaries, inflation_adj = eval_market_value(
+        productions,
+        years,
+        prod_function,
+        base_year=base_year,
+        inflation_rate=inflation_rate,
+    )
+
+    # Option handling - the first option year with negative remaining value is
+    # declined, along with every season after it
+    remaining_vals = remaining_values(
+        market_salaries, salaries, option_salaries, void_dead_caps
+    )
+    is_declined = is_option_year & (remaining_vals < 0)
+    n_declined = np.cumsum(is_declined, axis=-1)
+    after_decline = n_declined > 0
+    at_decline = is_declined & (n_declined == 1)
+
+    # Declined seasons produce nothing, but non-option seasons after the decline
+    # are still valued at zero production
+    production = np.where(after_decline, 0.0, productions)
+    zero_market_salaries = prod_function(0.0) * inflation_adj
+    market_salary = np.where(
+        after_decline,
+        np.where(is_option_year, 0.0, zero_market_salaries),
+        market_salaries,
+    )
+    is_option_tendered = is_option_year & ~after_decline
+    actual_salary = np.where(is_option_tendered, option_salaries, salaries)
+    actual_salary = np.where(at_decline, option_dead_caps, actual_salary)
+
+    # Void year handling
+    market_salary = np.where(is_void_year, 0.0, market_salary)
+    actual_salary = np.where(is_void_year, void_dead_caps, actual_salary)
+
+    # Padded seasons carry no values
+    production = np.where(valid, production, np.nan)
+    market_salary = np.where(valid, market_salary, np.nan)
+    actual_salary = np.where(valid, actual_salary, np.nan)
+
+    return BatchEvaluation(
+        production,
+        inflation_adj,
+        market_salary,
+        actual_salary,
+        market_salary - actual_salary,
+        is_option_tendered,
+        valid,
+    )
+
+
+def pack_contracts(contracts: list, productions: list = None) -> dict:
+    """
+    Pack a list of Contracts (and optionally a list of production lists) into
+    padded NumPy arrays accepted as keyword arguments by evaluate_batch
+    """
+    n_seasons = max((len(ct.seasons) for ct in contracts), default=0)
+    shape = (len(contracts), n_seasons)
+    packed = {
+        "years": np.full(shape, np.nan),
+        "salaries": np.full(shape, np.nan),
+        "option_salaries": np.full(shape, np.nan),
+        "option_dead_caps": np.full(shape, np.nan),
+        "void_dead_caps": np.full(shape, np.nan),
+    }
+    for ix, ct in enumerate(contracts):
+        for jx, (year, contract_season) in enumerate(ct):
+            packed["years"][ix, jx] = year
+            packed["salaries"][ix, jx] = contract_season.salary
+            if contract_season.is_option_year:
+                packed["option_salaries"][ix, jx] = contract_season.option_salary
+                packed["option_dead_caps"][ix, jx] = contract_season.option_dead_cap
+            if contract_season.is_void_year:
+                packed["void_dead_caps"][ix, jx] = contract_season.void_dead_cap
+    if productions is not None:
+        packed["productions"] = np.full(shape, np.nan)
+        for ix, prods in enumerate(productions):
+            packed["productions"][ix, : len(prods)] = prods
+    return packed
+
+
+def evaluate_contracts(
+    contracts: list, productions: list, prod_function=get_apy_prod_value_6_poly
+) -> BatchEvaluation:
+    """Evaluate a list of Contracts against their production lists in one pass"""
+    packed = pack_contracts(contracts, productions)
+    return evaluate_batch(**packed, prod_function=prod_function)
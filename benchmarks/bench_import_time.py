@@ -0,0 +1,64 @@
+"""
+Import-time benchmark of the evaluation modules, via `python -X importtime`.
+Reports the median cumulative import time of each module and fails if any of
+the display-only dependencies are pulled in.  Run from the repository root:
+
+    python benchmarks/bench_import_time.py [--max-ms 400]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["contract", "batch", "compare"]
+HEAVY_MODULES = ["pandas", "plotly", "scipy", "tabulate"]
+
+
+def import_time(module: str) -> tuple:
+    """Get the cumulative import time (us) of a module and the modules it imported"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative)
+    return imported[module], set(imported)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        times = []
+        for _ in range(args.repeat):
+            cumulative, imported = import_time(module)
+            times.append(cumulative)
+        median_ms = statistics.median(times) / 1000
+        heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+        print(f"{module:<12}{median_ms:>8.1f} ms")
+        if heavy:
+            print(f"  imports display dependencies: {', '.join(heavy[:5])}")
+            failed = True
+        if args.max_ms is not None and median_ms > args.max_ms:
+            print(f"  exceeds {args.max_ms:.0f} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Memory benchmark of a league-history store: bytes per contract held as
+Contract objects with dict-based seasons (the layout before ContractSeason
+had __slots__), as Contract objects with slotted ContractSeasons, and as a
+ContractTable.  Run from the repository root:
+
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract import ContractSeason  # noqa: E402
+from sample_contracts import lawrence_contract  # noqa: E402
+from table import ContractTable  # noqa: E402
+
+N_CONTRACTS = 10000
+
+
+class DictContractSeason:
+    """A ContractSeason's fields held in a per-instance __dict__"""
+
+    def __init__(self, contract_season: ContractSeason) -> None:
+        for name in ContractSeason.__slots__:
+            setattr(self, name, getattr(contract_season, name))
+
+
+def dict_season_contract():
+    ct = lawrence_contract()
+    ct.seasons = [DictContractSeason(contract_season) for contract_season in ct.seasons]
+    return ct
+
+
+def traced_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    _, dict_bytes = traced_bytes(
+        lambda: [dict_season_contract() for _ in range(N_CONTRACTS)]
+    )
+    contracts, contract_bytes = traced_bytes(
+        lambda: [lawrence_contract() for _ in range(N_CONTRACTS)]
+    )
+    table, table_bytes = traced_bytes(lambda: ContractTable.from_contracts(contracts))
+    for name, size in (
+        ("dict-based seasons", dict_bytes),
+        ("slotted seasons", contract_bytes),
+        ("ContractTable", table_bytes),
+    ):
+        print(
+            f"{name:<20}{size / N_CONTRACTS:>10.0f} bytes/contract"
+            f"{size / dict_bytes:>8.2f}x dict-based"
+        )
+
+
+if __name__ == "__main__":
+    main()
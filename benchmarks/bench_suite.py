@@ -0,0 +1,251 @@
+"""
+Benchmark suite of the hot paths on a synthetic league: Contract construction
+and from_records, ContractEvaluation.evaluate with 0, 2 and 5 option years and
+void years, breakeven points, market_value, string breakdowns, to_df, and
+breakdown figure building and export (export only if kaleido is installed).
+Results are written as JSON and can be compared against a stored baseline,
+such as benchmarks/baseline.json.  Run from the repository root:
+
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --output benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract import Contract, ContractEvaluation  # noqa: E402
+from compare import find_breakeven_point  # noqa: E402
+from render import render_figures  # noqa: E402
+from value import market_value  # noqa: E402
+
+
+def synthetic_records(rng, n_seasons: int, n_options: int, n_voids: int) -> list:
+    """Season records of a contract ending in option years, then void years"""
+    records = []
+    for ix in range(n_seasons):
+        is_void_year = ix >= n_seasons - n_voids
+        is_option_year = not is_void_year and ix >= n_seasons - n_voids - n_options
+        records.append(
+            {
+                "year": 2024 + ix,
+                "is_option_year": is_option_year,
+                "is_void_year": is_void_year,
+                "salary": 0.0 if is_option_year or is_void_year else rng.uniform(5, 60),
+                "option_salary": rng.uniform(30, 80) if is_option_year else None,
+                "option_dead_cap": rng.uniform(0, 30) if is_option_year else None,
+                "void_dead_cap": rng.uniform(5, 25) if is_void_year else None,
+            }
+        )
+    return records
+
+
+def synthetic_league(n_contracts: int, n_options: int, n_voids: int, seed: int = 0):
+    """Get season records and production lists of a synthetic league"""
+    rng = np.random.default_rng(seed)
+    league = []
+    for _ in range(n_contracts):
+        n_seasons = n_options + n_voids + int(rng.integers(2, 6))
+        records = synthetic_records(rng, n_seasons, n_options, n_voids)
+        productions = rng.uniform(30, 85, n_seasons).round(1).tolist()
+        league.append((records, productions))
+    return league
+
+
+def shorthand_kwargs(records: list) -> dict:
+    """
+    Get Contract shorthand arguments with the shape of a contract's season
+    records.  The shorthand treats every season from the option year on as an
+    option year, so void seasons get zero option salaries
+    """
+    option_years = [record["year"] for record in records if record["is_option_year"]]
+    void_years = [record["year"] for record in records if record["is_void_year"]]
+    option_year = option_years[0] if option_years else None
+    void_year = void_years[0] if void_years else None
+    options = [
+        record for record in records if option_year and record["year"] >= option_year
+    ]
+    voids = [record for record in records if void_year and record["year"] >= void_year]
+    return {
+        "start_year": records[0]["year"],
+        "end_year": records[-1]["year"] + 1,
+        "salaries": [record["salary"] for record in records],
+        "option_year": option_year,
+        "option_salaries": [record["option_salary"] or 0.0 for record in options],
+        "option_dead_caps": [record["option_dead_cap"] or 0.0 for record in options],
+        "void_year": void_year,
+        "void_year_dead_caps": [record["void_dead_cap"] for record in voids],
+    }
+
+
+def evaluations(league: list) -> list:
+    return [
+        ContractEvaluation(Contract().from_records(records), productions)
+        for records, productions in league
+    ]
+
+
+def build_cases(n_contracts: int) -> dict:
+    """Get {name: (function, number of operations per call)} of every case"""
+    league = synthetic_league(n_contracts, 2, 1)
+    kwargs = [shorthand_kwargs(records) for records, _ in league]
+    n_breakeven = max(n_contracts // 20, 1)
+    n_render = max(n_contracts // 200, 1)
+    breakeven_contracts = [
+        Contract().from_records(records) for records, _ in league[:n_breakeven]
+    ]
+    evaluated = evaluations(league)
+    for eval_ct in evaluated:
+        eval_ct.evaluate()
+    prods = np.random.default_rng(0).uniform(30, 85, 10000).tolist()
+
+    cases = {
+        "contract_init": (
+            lambda: [Contract(**ct_kwargs) for ct_kwargs in kwargs],
+            n_contracts,
+        ),
+        "contract_from_records": (
+            lambda: [Contract().from_records(records) for records, _ in league],
+            n_contracts,
+        ),
+    }
+    for n_options, n_voids in ((0, 0), (2, 0), (5, 0), (2, 2)):
+        case_evals = evaluations(synthetic_league(n_contracts, n_options, n_voids))
+        cases[f"evaluate_{n_options}_options_{n_voids}_voids"] = (
+            lambda case_evals=case_evals: [
+                eval_ct.evaluate() for eval_ct in case_evals
+            ],
+            n_contracts,
+        )
+    cases.update(
+        {
+            "find_breakeven_point": (
+                lambda: [find_breakeven_point(ct) for ct in breakeven_contracts],
+                n_breakeven,
+            ),
+            "market_value": (
+                lambda: [market_value(prod, 2027) for prod in prods],
+                len(prods),
+            ),
+            "evaluation_str": (
+                lambda: [str(eval_ct) for eval_ct in evaluated[:n_breakeven]],
+                n_breakeven,
+            ),
+            "contract_to_df": (
+                lambda: [eval_ct.to_df() for eval_ct in evaluated[:n_breakeven]],
+                n_breakeven,
+            ),
+            "build_surplus_value_figure": (
+                lambda: [
+                    eval_ct.build_surplus_value_figure()
+                    for eval_ct in evaluated[:n_render]
+                ],
+                n_render,
+            ),
+        }
+    )
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return cases
+    figs = [eval_ct.build_surplus_value_figure() for eval_ct in evaluated[:n_render]]
+    output_dir = tempfile.mkdtemp(prefix="bench_render_")
+    paths = [os.path.join(output_dir, f"{ix}.png") for ix in range(n_render)]
+    cases["render_figures"] = (
+        lambda: render_figures(figs, paths, max_workers=1, force=True),
+        n_render,
+    )
+    return cases
+
+
+def run_case(func, n_ops: int, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) / n_ops)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "n_ops": n_ops,
+        "repeat": repeat,
+    }
+
+
+def compare_results(results: dict, baseline: dict, max_regression: float) -> list:
+    """Print each case against the baseline, returning the cases that regressed"""
+    regressed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<32}{result['min_s'] * 1e6:>12.2f} us/op   (new)")
+            continue
+        ratio = result["min_s"] / base["min_s"]
+        flag = "  REGRESSION" if ratio > max_regression else ""
+        print(
+            f"{name:<32}{result['min_s'] * 1e6:>12.2f} us/op "
+            f"{base['min_s'] * 1e6:>12.2f} baseline  x{ratio:.2f}{flag}"
+        )
+        if ratio > max_regression:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Run only these cases")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON file")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=1.2,
+        help="Fail if a case is slower than baseline by more than this factor",
+    )
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.contracts)
+    results = {}
+    for name, (func, n_ops) in cases.items():
+        if args.only and name not in args.only:
+            continue
+        func()  # warm up
+        results[name] = run_case(func, n_ops, args.repeat)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "contracts": args.contracts,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressed = compare_results(results, baseline, args.max_regression)
+    else:
+        for name, result in results.items():
+            print(f"{name:<32}{result['min_s'] * 1e6:>12.2f} us/op")
+    if regressed:
+        sys.exit(f"Regressed: {', '.join(regressed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+GRAPHIC_CACHE_DIR = "outputs/.graphics_cache"
+
+
+def evaluation_inputs(eval_ct) -> dict:
+    """Get the inputs that determine a ContractEvaluation's results"""
+    return {
+        "seasons": [
+            [
+                contract_season.year,
+                bool(contract_season.is_option_year),
+                bool(contract_season.is_void_year),
+                contract_season.salary,
+                contract_season.option_salary,
+                contract_season.option_dead_cap,
+                contract_season.void_dead_cap,
+            ]
+            for _, contract_season in eval_ct
+        ],
+        "productions": list(eval_ct.productions),
+        "model": getattr(
+            eval_ct.prod_function, "__name__", repr(eval_ct.prod_function)
+        ),
+    }
+
+
+def graphic_key(eval_ct, style: str = "surplus_value") -> str:
+    """
+    Get a stable content hash of everything a ContractEvaluation's breakdown
+    graphic depends on: the contract seasons, productions, value model, player
+    name and graphic style
+    """
+    inputs = evaluation_inputs(eval_ct)
+    inputs["player_name"] = eval_ct.player_name
+    inputs["style"] = style
+    encoded = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def evaluation_key(eval_ct) -> tuple:
+    """
+    Get a canonical hashable key for a ContractEvaluation's contract seasons,
+    productions and value model
+    """
+    seasons = tuple(
+        (
+            contract_season.year,
+            bool(contract_season.is_option_year),
+            bool(contract_season.is_void_year),
+            contract_season.salary,
+            contract_season.option_salary,
+            contract_season.option_dead_cap,
+            contract_season.void_dead_cap,
+        )
+        for _, contract_season in eval_ct
+    )
+    return seasons, tuple(eval_ct.productions), eval_ct.prod_function
+
+
+class EvaluationCache:
+    """
+    Thread-safe memo of ContractEvaluation results, keyed by evaluation_key
+    and bounded to the maxsize most recently used entries
+    """
+
+    SEASON_FIELDS = (
+        "production",
+        "inflation_adj",
+        "market_salary",
+        "actual_salary",
+        "surplus_value",
+        "is_option_tendered",
+    )
+    VALUE_FIELDS = (
+        "surplus_value",
+        "market_value",
+        "total_value",
+        "is_option_declined",
+    )
+
+    maxsize: int
+    entries: OrderedDict
+    hits: int
+    misses: int
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self.entries
+
+    def __repr__(self) -> str:
+        return (
+            f"EvaluationCache({len(self)}/{self.maxsize} entries, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
+
+    def get(self, key: tuple) -> tuple:
+        """Get the snapshot stored for a key, or None on a miss"""
+        with self.lock:
+            snapshot = self.entries.get(key)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+    def put(self, key: tuple, snapshot: tuple) -> None:
+        with self.lock:
+            self.entries[key] = snapshot
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key: tuple) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def load(self, eval_ct, key: tuple = None) -> bool:
+        """
+        Restore a cached evaluation into a ContractEvaluation's seasons and
+        values.  Returns whether the evaluation was cached
+        """
+        snapshot = self.get(evaluation_key(eval_ct) if key is None else key)
+        if snapshot is None:
+            return False
+        seasons, values = snapshot
+        for contract_season, season_values in zip(eval_ct.seasons, seasons):
+            for name, val in zip(self.SEASON_FIELDS, season_values):
+                setattr(contract_season, name, val)
+        for name, val in zip(self.VALUE_FIELDS, values):
+            setattr(eval_ct, name, val)
+        return True
+
+    def store(self, eval_ct, key: tuple = None) -> None:
+        """Snapshot an evaluated ContractEvaluation into the cache"""
+        seasons = tuple(
+            tuple(getattr(contract_season, name) for name in self.SEASON_FIELDS)
+            for contract_season in eval_ct.seasons
+        )
+        values = tuple(getattr(eval_ct, name) for name in self.VALUE_FIELDS)
+        self.put(evaluation_key(eval_ct) if key is None else key, (seasons, values))
+
+
+class GraphicCache:
+    """
+    Content-addressed on-disk cache of rendered graphics.  Images are stored
+    under the hash of their inputs, with an index ordered by last access used
+    to evict the least recently used images beyond max_bytes
+    """
+
+    cache_dir: str
+    max_bytes: int
+    index: dict
+
+    INDEX_NAME = "index.json"
+
+    def __init__(
+        self, cache_dir: str = GRAPHIC_CACHE_DIR, max_bytes: int = 512 * 2**20
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self.load_index()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index and os.path.exists(self.path(key))
+
+    def __repr__(self) -> str:
+        return f"GraphicCache({len(self)} images, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry["size"] for entry in self.index.values())
+
+    def path(self, key: str, ext: str = ".png") -> str:
+        return os.path.join(self.cache_dir, f"{key}{ext}")
+
+    def load_index(self) -> dict:
+        path = os.path.join(self.cache_dir, self.INDEX_NAME)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_index(self) -> None:
+        path = os.path.join(self.cache_dir, self.INDEX_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, path)
+
+    def get(self, key: str, dest: str = None) -> str:
+        """
+        Get the cached image for a key, copying it to dest if given.  Returns
+        the path of the image, or None on a miss
+        """
+        if key not in self:
+            self.index.pop(key, None)
+            return None
+        entry = self.index.pop(key)
+        entry["last_access"] = time.time()
+        self.index[key] = entry
+        self.save_index()
+        if dest is None:
+            return self.path(key)
+        dest_dir = os.path.dirname(dest)
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+        shutil.copyfile(self.path(key), dest)
+        return dest
+
+    def put(self, key: str, src: str) -> str:
+        """Add a rendered image to the cache, evicting old images if needed"""
+        path = self.path(key)
+        shutil.copyfile(src, path)
+        self.index.pop(key, None)
+        self.index[key] = {"size": os.path.getsize(path), "last_access": time.time()}
+        self.evict()
+        self.save_index()
+        return path
+
+    def evict(self) -> None:
+        """Remove least recently used images until the cache fits in max_bytes"""
+        total = self.nbytes
+        # The index is kept in order of access, least recent first
+        for key in list(self.index):
+            if total <= self.max_bytes:
+                break
+            total -= self.index.pop(key)["size"]
+            if os.path.exists(self.path(key)):
+                os.remove(self.path(key))
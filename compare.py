@@ -1,5 +1,45 @@
+import numpy as np
 from contract import ContractEvaluation, Contract
-from scipy.optimize import minimize
+from value import market_value as eval_market_value, get_apy_prod_value_6_poly
+from batch import pack_contracts, evaluate_batch, remaining_values
+
+QBR_GRID = np.linspace(0.0, 100.0, 101)
+
+
+class BreakevenResult:
+    """
+    Breakeven QBR for a batch of contracts, along with the option decisions
+    (tendered or declined) each contract ends up with at its breakeven point
+    """
+
+    breakeven_points: np.ndarray
+    years: np.ndarray
+    is_option_year: np.ndarray
+    is_option_tendered: np.ndarray
+
+    def __init__(
+        self, breakeven_points, years, is_option_year, is_option_tendered
+    ) -> None:
+        self.breakeven_points = breakeven_points
+        self.years = years
+        self.is_option_year = is_option_year
+        self.is_option_tendered = is_option_tendered
+
+    def __len__(self) -> int:
+        return len(self.breakeven_points)
+
+    def __getitem__(self, ix):
+        return self.breakeven_points[ix]
+
+    def option_regime(self, ix: int) -> dict:
+        """Get whether each option year is tendered at the breakeven point"""
+        return {
+            int(year): bool(is_tendered)
+            for year, is_option_year, is_tendered in zip(
+                self.years[ix], self.is_option_year[ix], self.is_option_tendered[ix]
+            )
+            if is_option_year
+        }
 
 
 def zero_surplus_value(prod: float, ct: Contract):
@@ -9,27 +49,162 @@ def zero_surplus_value(prod: float, ct: Contract):
     return abs(0 - surplus_value)
 
 
-def find_breakeven_point(ct: Contract) -> int:
+def first_crossing(func, grid_vals, grid=QBR_GRID, xtol: float = 1e-9):
+    """
+    Finds the smallest QBR at which func turns non-negative, given its values
+    on a QBR grid along the last axis of grid_vals.  The first crossing on the
+    grid brackets the root, which is then bisected for every row at once.
+    Rows that are never non-negative on the grid get NaN
+    """
+    is_positive = grid_vals >= 0
+    has_root = is_positive.any(axis=-1)
+    hi_ix = np.argmax(is_positive, axis=-1)
+    lo = grid[np.maximum(hi_ix - 1, 0)]
+    hi = grid[hi_ix]
+    while np.any(hi - lo > xtol):
+        mid = (lo + hi) / 2
+        is_mid_positive = func(mid) >= 0
+        hi = np.where(is_mid_positive, mid, hi)
+        lo = np.where(is_mid_positive, lo, mid)
+    return np.where(has_root, hi, np.nan)
+
+
+def find_breakeven_points(
+    contracts: list,
+    prod_function=get_apy_prod_value_6_poly,
+    xtol: float = 1e-9,
+) -> BreakevenResult:
+    """
+    Finds the minimum average QBR each QB would have to produce in order to
+    return positive value on their contract.  Surplus value is not monotone in
+    QBR, so this is the first crossing to positive value.  Contracts that never
+    return positive value for QBR in [0, 100] get NaN
+    """
+    packed = pack_contracts(contracts)
+
+    def surplus_values(prods):
+        result = evaluate_batch(
+            **packed, productions=prods[:, np.newaxis], prod_function=prod_function
+        )
+        return result.surplus_value
+
+    grid_vals = evaluate_batch(
+        **{key: arr[:, np.newaxis, :] for key, arr in packed.items()},
+        productions=QBR_GRID[:, np.newaxis],
+        prod_function=prod_function,
+    ).surplus_value
+    breakeven_points = first_crossing(surplus_values, grid_vals, xtol=xtol)
+
+    # Get the option decisions at the root
+    result = evaluate_batch(
+        **packed,
+        productions=np.nan_to_num(breakeven_points)[:, np.newaxis],
+        prod_function=prod_function,
+    )
+    return BreakevenResult(
+        breakeven_points,
+        packed["years"],
+        ~np.isnan(packed["option_salaries"]),
+        result.is_option_tendered,
+    )
+
+
+def find_breakeven_point(ct: Contract) -> float:
     """
     Finds the minimum average QBR a QB would have to produce in
     order to return positive value on the contract
     """
-    prod = minimize(zero_surplus_value, [50], args=(ct,), tol=1.0)
-    breakeven_point = int(prod.x[0])
-    return breakeven_point
+    return float(find_breakeven_points([ct])[0])
+
+
+def constant_remaining_values(packed: dict, prods, prod_function) -> np.ndarray:
+    """
+    Gets the remaining value of each contract from every season onward, with
+    QBR held constant at prods.  prods is broadcast against the (contract x
+    season) arrays in packed
+    """
+    market_salaries, _ = eval_market_value(prods, packed["years"], prod_function)
+    return remaining_values(
+        market_salaries,
+        packed["salaries"],
+        packed["option_salaries"],
+        packed["void_dead_caps"],
+    )
+
+
+def find_option_tender_seasons(
+    contracts: list, prod_function=get_apy_prod_value_6_poly, xtol: float = 1e-9
+) -> np.ndarray:
+    """
+    Finds, for every option year of every contract, the minimum QBR a QB would
+    have to produce from that season on in order to make it worth tendering the
+    option.  Returns a (contract x season) array, NaN outside option years and
+    where the option is never worth tendering
+    """
+    packed = pack_contracts(contracts)
+    expanded = {key: arr[:, np.newaxis, :] for key, arr in packed.items()}
+    is_option_year = ~np.isnan(packed["option_salaries"])
+
+    def option_vals(prods):
+        # Each season's option is valued at its own QBR
+        remaining_vals = constant_remaining_values(
+            expanded, prods[:, :, np.newaxis], prod_function
+        )
+        return np.diagonal(remaining_vals, axis1=1, axis2=2)
+
+    # One market value table over the QBR grid serves every season
+    grid_vals = constant_remaining_values(
+        expanded, QBR_GRID[:, np.newaxis], prod_function
+    )
+    thresholds = first_crossing(option_vals, np.swapaxes(grid_vals, 1, 2), xtol=xtol)
+    return np.where(is_option_year, thresholds, np.nan)
+
+
+def find_option_tender_avgs(
+    contracts: list, prod_function=get_apy_prod_value_6_poly, xtol: float = 1e-9
+) -> np.ndarray:
+    """
+    Finds the minimum average QBR each QB would have to produce in order to
+    make it worth tendering ALL of their option years.  Contracts without
+    option years, or whose options are never all worth tendering, get NaN
+    """
+    packed = pack_contracts(contracts)
+    expanded = {key: arr[:, np.newaxis, :] for key, arr in packed.items()}
+    is_option_year = ~np.isnan(packed["option_salaries"])
+
+    def min_option_vals(remaining_vals, is_option_year):
+        return np.where(is_option_year, remaining_vals, np.inf).min(axis=-1)
+
+    def option_vals(prods):
+        remaining_vals = constant_remaining_values(
+            packed, prods[:, np.newaxis], prod_function
+        )
+        return min_option_vals(remaining_vals, is_option_year)
+
+    grid_vals = min_option_vals(
+        constant_remaining_values(expanded, QBR_GRID[:, np.newaxis], prod_function),
+        is_option_year[:, np.newaxis, :],
+    )
+    tender_avgs = first_crossing(option_vals, grid_vals, xtol=xtol)
+    return np.where(is_option_year.any(axis=-1), tender_avgs, np.nan)
 
 
-def find_option_tender_avg(ct: ContractEvaluation) -> int:
+def find_option_tender_avg(ct: Contract) -> float:
     """
     Finds the average QBR a QB would have to produce in
     order to make it worth tendering ALL option years
     """
-    pass
+    return float(find_option_tender_avgs([ct])[0])
 
 
-def find_option_tender_season(ct: ContractEvaluation) -> int:
+def find_option_tender_season(ct: Contract) -> dict:
     """
     Finds the QBR by year a QB would have to produce in
     order to make it worth tendering ALL option years
     """
-    pass
+    thresholds = find_option_tender_seasons([ct])[0]
+    return {
+        year: float(threshold)
+        for (year, contract_season), threshold in zip(ct, thresholds)
+        if contract_season.is_option_year
+    }
@@ -1,20 +1,27 @@
-import pandas as pd
-from value import market_value as eval_market_value
-import tabulate
-import plotly.graph_objects as go
-import plotly.colors as colors
+from typing import TYPE_CHECKING
+from value import (
+    market_value as eval_market_value,
+    get_apy_prod_value_6_poly,
+    get_model,
+)
+from cache import evaluation_key
 import os
 
+# pandas, tabulate and plotly are only needed for display, so they are
+# imported where they are used to keep `import contract` light
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class Contract:
-    seasons: list = []
+    seasons: list
 
     has_option_years: bool = False
     has_void_years: bool = False
 
     total_value: float = None
 
-    breakdown: list = None
+    _breakdown: list = None
 
     def __init__(
         self,
@@ -27,14 +34,15 @@ class Contract:
         void_year: int = None,
         void_year_dead_caps: list = [],
     ) -> None:
+        self.seasons = []
         if start_year is None or end_year is None:
             return
         option_ix = 0
         void_ix = 0
         for ix, season in enumerate(range(start_year, end_year)):
             salary = salaries[ix]
-            is_option_year = season >= option_year
-            is_void_year = season >= void_year
+            is_option_year = option_year is not None and season >= option_year
+            is_void_year = void_year is not None and season >= void_year
             if is_option_year:
                 option_salary = option_salaries[option_ix]
                 option_dead_cap = option_dead_caps[option_ix]
@@ -70,8 +78,8 @@ class Contract:
         )
 
     def __str__(self):
-        if not self.breakdown:
-            self.generate_breakdown()
+        import tabulate
+
         headers = self.breakdown[0].keys()
         rows = [x.values() for x in self.breakdown]
         return tabulate.tabulate(rows, headers)
@@ -86,6 +94,17 @@ class Contract:
     def __getitem__(self, ix):
         return self.seasons[ix]
 
+    @property
+    def breakdown(self) -> list:
+        """Display rows of each season, generated on first access"""
+        if self._breakdown is None:
+            self.generate_breakdown()
+        return self._breakdown
+
+    @breakdown.setter
+    def breakdown(self, breakdown: list) -> None:
+        self._breakdown = breakdown
+
     def sort(self) -> None:
         self.seasons.sort(key=lambda x: x.year)
         return
@@ -110,7 +129,9 @@ class Contract:
             rc.append(season.to_dict())
         return rc
 
-    def to_df(self) -> pd.DataFrame:
+    def to_df(self) -> "pd.DataFrame":
+        import pandas as pd
+
         df = pd.DataFrame().from_records(self.to_records())
         return df
 
@@ -158,6 +179,22 @@ class Contract:
 
 
 class ContractSeason:
+    __slots__ = (
+        "year",
+        "is_option_year",
+        "is_option_tendered",
+        "is_void_year",
+        "salary",
+        "option_salary",
+        "option_dead_cap",
+        "void_dead_cap",
+        "production",
+        "inflation_adj",
+        "market_salary",
+        "actual_salary",
+        "surplus_value",
+    )
+
     year: int
     is_option_year: bool
     is_option_tendered: bool
@@ -171,7 +208,7 @@ class ContractSeason:
     inflation_adj: float
     market_salary: float
     actual_salary: float
-    surplus_value: float = 0.0
+    surplus_value: float
 
     def __init__(
         self,
@@ -190,6 +227,7 @@ class ContractSeason:
     ) -> None:
         self.year = year
         self.is_option_year = is_option_year
+        self.is_option_tendered = None
         self.is_void_year = is_void_year
         self.salary = salary
         self.option_salary = option_salary
@@ -202,6 +240,8 @@ class ContractSeason:
         self.surplus_value = surplus_value
 
     def __str__(self):
+        import tabulate
+
         as_dict = self.to_dict()
         headers = as_dict.keys()
         rows = [as_dict.values()]
@@ -252,19 +292,31 @@ class ContractEvaluation(Contract):
     surplus_value: float = None
     market_value: float = None
     player_name: str = None
+    prod_function = get_apy_prod_value_6_poly
+    cache = None
+
+    # (market value, inflation adjustment) of each season's own production,
+    # and remaining option values, kept for incremental re-evaluation
+    market_vals: list = None
+    remaining_vals: list = None
 
     def __init__(
-        self, contract: Contract = None, productions: list = [], player_name: str = None
+        self,
+        contract: Contract = None,
+        productions: list = [],
+        player_name: str = None,
+        prod_function=get_apy_prod_value_6_poly,
+        cache=None,
     ) -> None:
         self.productions = productions
+        self.prod_function = get_model(prod_function)
+        self.cache = cache
+        self.seasons = contract.seasons
         self.has_option_years = contract.has_option_years
         self.has_void_years = contract.has_void_years
         self.player_name = player_name
-        for ix, ((_, contract_season), production) in enumerate(
-            zip(contract, productions)
-        ):
+        for (_, contract_season), production in zip(contract, productions):
             contract_season.production = production
-            self.seasons[ix] = contract_season
         return
 
     def __repr__(self) -> str:
@@ -275,21 +327,52 @@ class ContractEvaluation(Contract):
         return f"ContractEvaluation({start_year}-{end_year})"
 
     def set_productions(self, productions: list):
+        if self.cache is not None:
+            self.cache.invalidate(evaluation_key(self))
+        self.productions = productions
         for contract_season, prod in zip(self.seasons, productions):
             contract_season.production = prod
+        self.breakdown = None
         return
 
-    def get_remaining_val(self, start_year: int):
+    def get_remaining_vals(self, market_vals: list = None) -> list:
+        """
+        Get the remaining value of the contract from every season onward, with
+        a single reverse pass over the seasons.  Option seasons are valued at
+        their option salary and void seasons at minus their dead cap.  Seasons
+        before the first option year are not needed for option decisions and
+        are left as None
+        """
+        remaining_vals = [None for _ in self.seasons]
+        option_ixs = [
+            ix
+            for ix, contract_season in enumerate(self.seasons)
+            if contract_season.is_option_year
+        ]
+        if not option_ixs:
+            return remaining_vals
         remaining_val = 0.0
-        for year, contract_season in self.__iter__():
-            if year < start_year:
-                continue
+        for ix in range(len(self.seasons) - 1, option_ixs[0] - 1, -1):
+            contract_season = self.seasons[ix]
             if contract_season.is_void_year:
                 remaining_val -= contract_season.void_dead_cap
             else:
-                market_val, _ = eval_market_value(contract_season.production, year)
-                remaining_val += market_val - contract_season.option_salary
-        return remaining_val
+                market_val = (
+                    market_vals[ix]
+                    if market_vals is not None
+                    else eval_market_value(
+                        contract_season.production,
+                        contract_season.year,
+                        self.prod_function,
+                    )[0]
+                )
+                remaining_val += market_val - (
+                    contract_season.option_salary
+                    if contract_season.is_option_year
+                    else contract_season.salary
+                )
+            remaining_vals[ix] = remaining_val
+        return remaining_vals
 
     def decline_option_years(self, start_year: int):
         self.is_option_declined = True
@@ -340,14 +423,54 @@ class ContractEvaluation(Contract):
         self.breakdown = breakdown
 
     def evaluate(self) -> float:
+        # Restore a memoized evaluation of the same contract and productions
+        if self.cache is not None:
+            key = evaluation_key(self)
+            if self.cache.load(self, key):
+                self.market_vals = None
+                self.breakdown = None
+                return self.surplus_value
+
         # Reset value sums in case productions have changed
         self.reset_values()
 
-        for year, contract_season in self.__iter__():
-            # Get contract values
-            val_prod, inflation_adj = eval_market_value(
-                contract_season.production, year
-            )
+        # Get contract values
+        self.market_vals = [
+            eval_market_value(contract_season.production, year, self.prod_function)
+            for year, contract_season in self.__iter__()
+        ]
+
+        # Get the value of every option up front in a single pass
+        self.remaining_vals = self.get_remaining_vals(
+            [val_prod for val_prod, _ in self.market_vals]
+        )
+
+        self.evaluate_seasons()
+        self.sum_values()
+
+        if self.cache is not None:
+            self.cache.store(self, key)
+
+        # The breakdown is only for display, so it is generated when accessed
+        self.breakdown = None
+
+        return self.surplus_value
+
+    def evaluate_seasons(self, start_ix: int = 0, stop_ix: int = None) -> None:
+        """
+        Value seasons start_ix to stop_ix from the stored market and remaining
+        values, tendering or declining options as they are reached
+        """
+        stop_ix = len(self.seasons) if stop_ix is None else stop_ix
+        for ix in range(start_ix, stop_ix):
+            contract_season = self.seasons[ix]
+            year = contract_season.year
+            val_prod, inflation_adj = self.market_vals[ix]
+            if self.is_option_declined:
+                # Seasons after a declined option no longer produce
+                val_prod, _ = eval_market_value(
+                    contract_season.production, year, self.prod_function
+                )
 
             # Set base values in season
             contract_season.inflation_adj = inflation_adj
@@ -361,7 +484,7 @@ class ContractEvaluation(Contract):
             # Option handling - skip if option has already been declined
             if contract_season.is_option_year and not self.is_option_declined:
                 # Get the value of the option
-                remaining_surplus_val = self.get_remaining_val(year)
+                remaining_surplus_val = self.remaining_vals[ix]
 
                 # Option will be declined if it has negative value, else it will be tendered
                 if remaining_surplus_val < 0:
@@ -380,23 +503,106 @@ class ContractEvaluation(Contract):
             contract_season.surplus_value = (
                 contract_season.market_salary - contract_season.actual_salary
             )
+        return
 
-            # Accumulate contract value
+    def sum_values(self) -> None:
+        """Accumulate contract values from the evaluated seasons"""
+        self.surplus_value = 0.0
+        self.market_value = 0.0
+        self.total_value = 0.0
+        for contract_season in self.seasons:
             self.surplus_value += contract_season.surplus_value
             self.market_value += contract_season.market_salary
             self.total_value += contract_season.actual_salary
+        return
+
+    def update_production(self, year: int, production) -> float:
+        """
+        Change the production of one season and re-evaluate incrementally.
+        Only that season's market value is recomputed, and only that season,
+        or the option seasons onward if it can change an option decision, are
+        re-valued.  Returns the new surplus value
+        """
+        years = [contract_season.year for contract_season in self.seasons]
+        if year not in years:
+            raise KeyError(f"No {year} season in contract")
+        ix = years.index(year)
+        if self.cache is not None:
+            self.cache.invalidate(evaluation_key(self))
+        productions = list(self.productions)
+        productions[ix] = production
+        self.productions = productions
+        if self.market_vals is None:
+            return self.evaluate()
+
+        self.market_vals[ix] = eval_market_value(production, year, self.prod_function)
+        self.remaining_vals = self.get_remaining_vals(
+            [val_prod for val_prod, _ in self.market_vals]
+        )
 
-        # Generate Breakdown
-        self.generate_breakdown()
+        # Seasons before the first option year don't affect option decisions
+        option_ixs = [
+            jx
+            for jx, contract_season in enumerate(self.seasons)
+            if contract_season.is_option_year
+        ]
+        option_ix = option_ixs[0] if option_ixs else len(self.seasons)
+        if ix < option_ix:
+            start_ix, stop_ix = ix, ix + 1
+        else:
+            # Option decisions are remade from the first option year
+            start_ix, stop_ix = option_ix, len(self.seasons)
+            self.is_option_declined = False
+        for contract_season, prod in zip(
+            self.seasons[start_ix:stop_ix], productions[start_ix:stop_ix]
+        ):
+            contract_season.production = prod
+            contract_season.is_option_tendered = None
+        self.evaluate_seasons(start_ix, stop_ix)
+        self.sum_values()
 
+        if self.cache is not None:
+            self.cache.store(self)
+        self.breakdown = None
         return self.surplus_value
 
     def reset_values(self):
+        self.is_option_declined = False
+        for contract_season, prod in zip(self.seasons, self.productions):
+            contract_season.production = prod
+            contract_season.is_option_tendered = None
         self.market_value = 0.0
         self.surplus_value = 0.0
         self.total_value = 0.0
 
-    def build_surplus_value_graphic(self, save_show=False):
+    def build_surplus_value_graphic(self, save_show=False, cache=None):
+        """
+        Show the breakdown graphic, or save it to outputs/contract_breakdowns.
+        With a cache.GraphicCache, a saved graphic whose inputs are unchanged
+        is copied from the cache instead of being rebuilt
+        """
+        path = f"outputs/contract_breakdowns/{self.player_name}.png"
+        if cache is not None and not save_show:
+            from cache import graphic_key
+
+            key = graphic_key(self)
+            if cache.get(key, path) is not None:
+                return
+        fig = self.build_surplus_value_figure()
+        if save_show:
+            fig.show()
+        else:
+            if not os.path.exists(f"outputs/contract_breakdowns"):
+                os.mkdir(f"outputs/contract_breakdowns")
+            fig.write_image(path)
+            if cache is not None:
+                cache.put(key, path)
+        return
+
+    def build_surplus_value_figure(self):
+        import plotly.graph_objects as go
+        import plotly.colors as colors
+
         if not self.breakdown:
             self.generate_breakdown()
         fig = go.Figure()
@@ -564,10 +770,4 @@ class ContractEvaluation(Contract):
             height=2000,
             template="ggplot2",
         )
-        if save_show:
-            fig.show()
-        else:
-            if not os.path.exists(f"outputs/contract_breakdowns"):
-                os.mkdir(f"outputs/contract_breakdowns")
-            fig.write_image(f"outputs/contract_breakdowns/{self.player_name}.png")
-        return
+        return fig
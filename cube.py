@@ -0,0 +1,200 @@
+"""
+Precomputed market values for every value model x season x QBR grid point.
+
+    python cube.py outputs/valuation_cube --first-season 2000 --last-season 2050
+
+builds the cube once.  Readers memory-map it read-only, so every worker
+process on a machine shares the same pages and opening a cube requires no
+computation and near-zero private memory.
+"""
+
+import argparse
+import numpy as np
+from store import load_arrays, save_arrays
+import utils
+from utils import inflation_coeff
+from value import PRODUCTION_VALUE_MODELS, SCALAR_TYPES, get_model, market_value
+
+
+def interpolate_scalar(values, pos: float, offset: int = 0) -> float:
+    """
+    Linearly interpolate values tabled at grid positions, stored from offset
+    on, at a fractional grid position pos before the last grid point
+    """
+    ix = int(pos)
+    lo_val = values[offset + ix]
+    return lo_val + (pos - ix) * (values[offset + ix + 1] - lo_val)
+
+
+def interpolate(values, pos, n_intervals: int, offset=0):
+    """
+    Linearly interpolate values tabled at grid positions 0 to n_intervals,
+    stored from offset on, at an array of fractional grid positions within
+    the grid.  offset may be an array broadcasting against pos
+    """
+    ix = np.clip(pos.astype(int), 0, n_intervals - 1)
+    lo_vals = values[offset + ix]
+    return lo_vals + (pos - ix) * (values[offset + ix + 1] - lo_vals)
+
+
+def build_cube(
+    path: str,
+    models: list = None,
+    seasons=range(2000, 2051),
+    lo: float = 0.0,
+    hi: float = 100.0,
+    step: float = 0.01,
+) -> None:
+    """
+    Precompute market_value for registered models (by default all of them)
+    over seasons and a QBR grid, saving the cube to a directory at path
+    """
+    models = list(PRODUCTION_VALUE_MODELS) if models is None else list(models)
+    seasons = np.asarray(seasons)
+    if np.any(np.diff(seasons) != 1):
+        raise ValueError("Cube seasons must be consecutive")
+    n_intervals = int(round((hi - lo) / step))
+    grid = np.linspace(lo, hi, n_intervals + 1)
+    inflation_adj = inflation_coeff(seasons - utils.BASE_YEAR)
+    values = np.stack(
+        [get_model(model)(grid)[None, :] * inflation_adj[:, None] for model in models]
+    )
+    save_arrays(
+        path,
+        {"values": values, "inflation_adj": inflation_adj},
+        {
+            "models": models,
+            "first_season": int(seasons[0]),
+            "lo": lo,
+            "hi": hi,
+            "step": step,
+            "base_year": utils.BASE_YEAR,
+            "inflation_rate": utils.INFLATION_RATE,
+        },
+    )
+
+
+class ValuationCube:
+    """
+    Read-only view of a cube built by build_cube.  Values between QBR grid
+    points are linearly interpolated, and values outside the grid or the cube's seasons are computed exactly with
+    value.market_value.  Cubes built for another base year or inflation rate
+    than utils' are rejected
+    """
+
+    values: np.ndarray
+    inflation_adj: np.ndarray
+    models: dict
+    first_season: int
+    lo: float
+    hi: float
+    step: float
+
+    def __init__(self, path: str, mmap_mode: str = "r") -> None:
+        arrays, meta = load_arrays(path, mmap_mode)
+        # Values outside the cube are computed with the current constants
+        constants = (utils.BASE_YEAR, utils.INFLATION_RATE)
+        if (meta["base_year"], meta["inflation_rate"]) != constants:
+            raise ValueError(
+                f"Cube at {path} was built for base year {meta['base_year']} and "
+                f"inflation rate {meta['inflation_rate']}, not {constants[0]} "
+                f"and {constants[1]}"
+            )
+        self.path = path
+        self.values = arrays["values"]
+        self.inflation_adj = arrays["inflation_adj"]
+        self.models = {model: ix for ix, model in enumerate(meta["models"])}
+        self.first_season = meta["first_season"]
+        self.lo = meta["lo"]
+        self.hi = meta["hi"]
+        self.step = meta["step"]
+        self.n_intervals = self.values.shape[-1] - 1
+        # Each model's (season x QBR) values as one flat array, for interpolation
+        self.model_values = [values.reshape(-1) for values in self.values]
+
+    def __repr__(self) -> str:
+        return f"ValuationCube({self.path}: {self.values.shape})"
+
+    @property
+    def seasons(self) -> range:
+        return range(self.first_season, self.first_season + len(self.inflation_adj))
+
+    def market_value(self, prod, season, model: str = "6_poly"):
+        """Get value of production in a given season, as value.market_value does"""
+        model_ix = self.models.get(model)
+        n_points = self.n_intervals + 1
+        if type(prod) in SCALAR_TYPES and type(season) is int:
+            season_ix = season - self.first_season
+            pos = (prod - self.lo) / self.step
+            if (
+                model_ix is None
+                or not 0 <= season_ix < len(self.inflation_adj)
+                or not 0 <= pos < self.n_intervals
+            ):
+                return market_value(prod, season, model)
+            value = interpolate_scalar(
+                self.model_values[model_ix], pos, season_ix * n_points
+            )
+            return float(value), float(self.inflation_adj[season_ix])
+
+        if model_ix is None:
+            return market_value(prod, season, model)
+        prod, season = np.broadcast_arrays(
+            np.asarray(prod, dtype=float), np.asarray(season)
+        )
+        season_ix = season.astype(int) - self.first_season
+        pos = (prod - self.lo) / self.step
+        in_cube = (
+            (season_ix >= 0)
+            & (season_ix < len(self.inflation_adj))
+            & (pos >= 0)
+            & (pos <= self.n_intervals)
+        )
+        season_ix = np.clip(season_ix, 0, len(self.inflation_adj) - 1)
+        value = interpolate(
+            self.model_values[model_ix],
+            pos,
+            self.n_intervals,
+            season_ix * n_points,
+        )
+        inflation_adj = self.inflation_adj[season_ix]
+        if not in_cube.all():
+            exact_value, exact_adj = market_value(
+                prod[~in_cube], season[~in_cube], model
+            )
+            value[~in_cube] = exact_value
+            inflation_adj = np.array(inflation_adj)
+            inflation_adj[~in_cube] = exact_adj
+        return value, inflation_adj
+
+
+CUBES = {}
+
+
+def get_cube(path: str) -> ValuationCube:
+    """Get this process's shared reader of the cube at path, opening it once"""
+    cube = CUBES.get(path)
+    if cube is None:
+        cube = ValuationCube(path)
+        CUBES[path] = cube
+    return cube
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a market valuation cube")
+    parser.add_argument("path", help="Output directory")
+    parser.add_argument("--models", nargs="*", help="Value models (default: all)")
+    parser.add_argument("--first-season", type=int, default=2000)
+    parser.add_argument("--last-season", type=int, default=2050)
+    parser.add_argument("--step", type=float, default=0.01, help="QBR grid step")
+    args = parser.parse_args(argv)
+    build_cube(
+        args.path,
+        args.models,
+        range(args.first_season, args.last_season + 1),
+        step=args.step,
+    )
+
+
+if __name__ == "__main__":
+    main()
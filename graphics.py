@@ -1,12 +1,9 @@
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.colors as colors
 import os
-import pandas as pd
 from value import get_apy_prod_value_6_poly
 
     
 def plot_market_value_curve(prod_func=get_apy_prod_value_6_poly):
+    import plotly.express as px
     prods = [x for x in range(0, 101)]
     values = [prod_func(prod) for prod in prods]
     fig = px.scatter(x=prods, y=values)
@@ -14,6 +11,7 @@ def plot_market_value_curve(prod_func=get_apy_prod_value_6_poly):
     
     
 def cost_per_production_trend():
+    import plotly.express as px
     seasons = [20, 21, 22, 23, 18, 19, 23, 21, 20, 23]
     cpw = [0.62, 0.65, 0.86, 0.81, 0.45, 0.58, 0.93, 0.75, 0.72, 0.75]
     fig = px.scatter(x=seasons, y=cpw, trendline='ols')
@@ -21,6 +19,20 @@ def cost_per_production_trend():
     
     
 def build_surplus_value_graphic(leaderboard, surplus_value, player_name, option_year=None, void_year=None, save_show=False):
+    fig = build_surplus_value_figure(leaderboard, surplus_value, player_name, option_year, void_year)
+    if save_show:
+        fig.show()
+    else:
+        if not os.path.exists(f"outputs/contract_breakdowns"):
+            os.mkdir(f"outputs/contract_breakdowns")
+        fig.write_image(f"outputs/contract_breakdowns/{player_name}.png")
+    return
+
+
+def build_surplus_value_figure(leaderboard, surplus_value, player_name, option_year=None, void_year=None):
+    import plotly.graph_objects as go
+    import plotly.colors as colors
+    import pandas as pd
     fig = go.Figure()
     leaderboard = pd.DataFrame(leaderboard)
     leaderboard.rename(columns={'QBR': 'Proj. QBR', 'Market Sal': 'Market Sal. ($M)', 'Actual Sal': 'Actual Sal. ($M)', 'Tot. Surplus Value': 'Surplus Value ($M)'}, inplace=True)
@@ -62,10 +74,4 @@ def build_surplus_value_graphic(leaderboard, surplus_value, player_name, option_
         height=2000,
         template='ggplot2',
     ) 
-    if save_show:
-        fig.show()
-    else:
-        if not os.path.exists(f"outputs/contract_breakdowns"):
-            os.mkdir(f"outputs/contract_breakdowns")
-        fig.write_image(f"outputs/contract_breakdowns/{player_name}.png")
-    return
\ No newline at end of file
+    return fig
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Streaming ingestion of contract-season records from JSONL or CSV files.
+
+Each line (or row) is one contract season, as accepted by
+Contract.from_records, plus the player_name and optionally contract_id it
+belongs to and its production as "prod" or "production":
+
+    {"contract_id": 17, "player_name": "Trevor Lawrence", "year": 2024,
+     "is_option_year": false, "is_void_year": false, "salary": 15.0, "prod": 56}
+
+Seasons of a contract must be contiguous in the file.  Only one chunk of
+contracts is resident at a time, so files of any size can be evaluated.
+"""
+
+import csv
+import json
+from runner import attach_productions, evaluate_chunk
+
+SEASON_FIELDS = (
+    "year",
+    "is_option_year",
+    "is_void_year",
+    "salary",
+    "option_salary",
+    "option_dead_cap",
+    "void_dead_cap",
+)
+PRODUCTION_FIELDS = ("prod", "production")
+TRUE_STRINGS = frozenset(("true", "t", "1", "yes", "y"))
+
+
+def parse_csv_record(row: dict) -> dict:
+    """Convert the strings of a CSV row to season record types"""
+    record = {}
+    for name, val in row.items():
+        if val is None or val == "":
+            record[name] = None
+        elif name == "year":
+            record[name] = int(val)
+        elif name in ("is_option_year", "is_void_year"):
+            record[name] = val.strip().lower() in TRUE_STRINGS
+        elif name in SEASON_FIELDS or name in PRODUCTION_FIELDS:
+            record[name] = float(val)
+        else:
+            record[name] = val
+    return record
+
+
+def read_records(path: str):
+    """Lazily read season records from a .jsonl or .csv file"""
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield parse_csv_record(row)
+        elif path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unsupported record file: {path}")
+
+
+def contract_key(record: dict):
+    contract_id = record.get("contract_id")
+    return record.get("player_name") if contract_id is None else contract_id
+
+
+def group_contracts(records):
+    """
+    Group contiguous season records into contract entries of the form
+    {"player_name", "contract_id", "seasons", "productions"}, as accepted by
+    runner.evaluate_chunk.  Productions are None if any season lacks one
+    """
+    entry, key = None, None
+    for record in records:
+        record_key = contract_key(record)
+        if entry is None or record_key != key:
+            if entry is not None:
+                yield entry
+            entry = {
+                "player_name": record.get("player_name"),
+                "contract_id": record.get("contract_id"),
+                "seasons": [],
+                "productions": [],
+            }
+            key = record_key
+        entry["seasons"].append(
+            {name: record[name] for name in SEASON_FIELDS if name in record}
+        )
+        production = next(
+            (
+                record[name]
+                for name in PRODUCTION_FIELDS
+                if record.get(name) is not None
+            ),
+            None,
+        )
+        if production is None or entry["productions"] is None:
+            entry["productions"] = None
+        else:
+            entry["productions"].append(production)
+    if entry is not None:
+        yield entry
+
+
+def read_contracts(path: str):
+    """Lazily read contract entries from a .jsonl or .csv file of season records"""
+    return group_contracts(read_records(path))
+
+
+def chunk_entries(entries, chunk_size: int):
+    """Lazily split an iterable of entries into lists of at most chunk_size"""
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_evaluations(
+    path: str,
+    chunk_size: int = 256,
+    productions: dict = None,
+    prod_function="6_poly",
+):
+    """
+    Evaluate the contracts of a .jsonl or .csv file of season records one
+    chunk at a time, yielding result rows as runner.evaluate_chunk does
+    """
+    for chunk in chunk_entries(read_contracts(path), chunk_size):
+        attach_productions(chunk, productions)
+        yield from evaluate_chunk(chunk, prod_function)
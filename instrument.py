@@ -0,0 +1,280 @@
+"""
+Opt-in instrumentation of the evaluation hot paths.
+
+    import instrument
+
+    with instrument.profile(trace=True) as prof:
+        eval_ct.evaluate()
+    print(prof.summary())
+    prof.save_chrome_trace("trace.json")  # open in chrome://tracing or Perfetto
+
+While a profile is active, every registered hook (Contract construction,
+evaluate and its phases, market_value, breakeven solving, rendering, ...)
+is wrapped to record its calls and wall time.  Hooks are only installed for
+the duration of a profile, so instrumentation costs nothing when disabled.
+A hooked module function is also wrapped wherever it was imported by name
+into a module loaded before the profile started.  Code can also mark its own
+phases with `with instrument.phase(name):`.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import types
+from functools import wraps
+
+DEFAULT_HOOKS = []
+HOOKS = []
+ACTIVE = None
+INSTALLED = {}
+
+
+def register_hook(owner, attr: str, name: str = None) -> None:
+    """
+    Register a function or method to be timed while profiling, as the phase
+    name (by default owner.attr).  owner is the module or class the function
+    is defined on
+    """
+    HOOKS.append((owner, attr, name or f"{owner.__name__}.{attr}"))
+
+
+def default_hooks() -> list:
+    """Get the registered hooks, after the evaluation hot paths"""
+    if not DEFAULT_HOOKS:
+        import batch
+        import compare
+        import contract
+        import render
+        import value
+
+        DEFAULT_HOOKS.extend(
+            (
+                (contract.Contract, "__init__", "Contract.__init__"),
+                (contract.Contract, "from_records", "Contract.from_records"),
+                (
+                    contract.Contract,
+                    "generate_breakdown",
+                    "Contract.generate_breakdown",
+                ),
+                (contract.ContractEvaluation, "evaluate", "evaluate"),
+                (
+                    contract.ContractEvaluation,
+                    "evaluate_seasons",
+                    "evaluate.option_cascade",
+                ),
+                (
+                    contract.ContractEvaluation,
+                    "get_remaining_vals",
+                    "get_remaining_vals",
+                ),
+                (
+                    contract.ContractEvaluation,
+                    "decline_option_years",
+                    "decline_option_years",
+                ),
+                (
+                    contract.ContractEvaluation,
+                    "generate_breakdown",
+                    "generate_breakdown",
+                ),
+                (contract.ContractEvaluation, "update_production", "update_production"),
+                (value, "market_value", "market_value"),
+                (batch, "evaluate_batch", "evaluate_batch"),
+                (compare, "find_breakeven_points", "breakeven"),
+                (compare, "first_crossing", "breakeven.first_crossing"),
+                (
+                    contract.ContractEvaluation,
+                    "build_surplus_value_figure",
+                    "render.figure",
+                ),
+                (
+                    contract.ContractEvaluation,
+                    "build_surplus_value_graphic",
+                    "render.graphic",
+                ),
+                (render, "render_figures", "render.export"),
+            )
+        )
+    return DEFAULT_HOOKS + HOOKS
+
+
+def bindings(owner, attr: str) -> list:
+    """
+    Get every (namespace, name) binding owner.attr.  For a module function,
+    that includes the modules that imported it by name
+    """
+    found = [(owner, attr)]
+    if isinstance(owner, types.ModuleType):
+        original = owner.__dict__[attr]
+        for module in list(sys.modules.values()):
+            if module is owner or not isinstance(module, types.ModuleType):
+                continue
+            for name, val in list(vars(module).items()):
+                if val is original:
+                    found.append((module, name))
+    return found
+
+
+class Profile:
+    """
+    Call counts and wall times of instrumented phases.  Total time includes
+    nested phases and self time excludes them.  With trace, every call is
+    also kept as an event for export as a Chrome trace
+    """
+
+    stats: dict
+    events: list
+
+    def __init__(self, trace: bool = False) -> None:
+        self.stats = {}
+        self.events = [] if trace else None
+        self.origin = time.perf_counter()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Profile({len(self.stats)} phases)"
+
+    def start(self) -> float:
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append(0.0)
+        return time.perf_counter()
+
+    def stop(self, name: str, start: float) -> None:
+        end = time.perf_counter()
+        elapsed = end - start
+        stack = self.local.stack
+        child_time = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = [0, 0.0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += elapsed - child_time
+            stats[3] = max(stats[3], elapsed)
+            if self.events is not None:
+                self.events.append((name, start, elapsed, threading.get_ident()))
+
+    def rows(self) -> list:
+        """Get (phase, calls, total s, self s, mean us, max us), most total time first"""
+        return sorted(
+            (
+                (name, calls, total, self_time, total / calls * 1e6, max_time * 1e6)
+                for name, (calls, total, self_time, max_time) in self.stats.items()
+            ),
+            key=lambda row: row[2],
+            reverse=True,
+        )
+
+    def summary(self) -> str:
+        import tabulate
+
+        headers = ["Phase", "Calls", "Total (s)", "Self (s)", "Mean (us)", "Max (us)"]
+        return tabulate.tabulate(self.rows(), headers, floatfmt=".4g")
+
+    def to_chrome_trace(self) -> dict:
+        """Get the traced events in Chrome trace event format"""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                }
+                for name, start, elapsed, tid in self.events or []
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def save_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def timed(func, name: str):
+    """Wrap a function to record its calls in the active profile"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = ACTIVE
+        if profile is None:
+            return func(*args, **kwargs)
+        start = profile.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.stop(name, start)
+
+    return wrapper
+
+
+def enable(profile: Profile) -> None:
+    """Make profile the active profile and install the registered hooks"""
+    global ACTIVE
+    if ACTIVE is not None:
+        raise RuntimeError("A profile is already active")
+    for owner, attr, name in default_hooks():
+        if (owner, attr) in INSTALLED:
+            continue
+        wrapper = timed(owner.__dict__[attr], name)
+        for namespace, binding in bindings(owner, attr):
+            if (namespace, binding) not in INSTALLED:
+                INSTALLED[(namespace, binding)] = vars(namespace)[binding]
+                setattr(namespace, binding, wrapper)
+    ACTIVE = profile
+
+
+def disable() -> None:
+    """Remove the installed hooks and deactivate the active profile"""
+    global ACTIVE
+    ACTIVE = None
+    for (owner, attr), original in INSTALLED.items():
+        setattr(owner, attr, original)
+    INSTALLED.clear()
+
+
+class profile:
+    """Context manager profiling the instrumented phases within it"""
+
+    def __init__(self, trace: bool = False) -> None:
+        self.profile = Profile(trace)
+
+    def __enter__(self) -> Profile:
+        enable(self.profile)
+        return self.profile
+
+    def __exit__(self, *exc) -> None:
+        disable()
+
+
+class phase:
+    """
+    Context manager recording a named phase of the caller's code in the
+    active profile, if there is one
+    """
+
+    __slots__ = ("name", "profile", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profile = ACTIVE
+
+    def __enter__(self):
+        if self.profile is not None:
+            self.start = self.profile.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.profile is not None:
+            self.profile.stop(self.name, self.start)
@@ -0,0 +1,237 @@
+import math
+import numpy as np
+from contract import Contract
+from value import get_apy_prod_value_6_poly, get_model, market_value
+
+
+class OptionValuation:
+    """
+    Optimal exercise of a contract's options under uncertain production,
+    solved by backward induction over a QBR lattice.  Each option is tendered
+    or declined knowing the previous season's QBR, so per-option-year arrays
+    have (option year x previous season QBR grid point) shape.  Values are of
+    the contract from its first option year on, as ContractEvaluation values
+    options
+    """
+
+    years: np.ndarray
+    grid: np.ndarray
+    tender_value: np.ndarray
+    decline_value: np.ndarray
+    expected_value: np.ndarray
+    is_tendered: np.ndarray
+    committed_value: np.ndarray
+    initial: np.ndarray
+    player_name: str = None
+
+    def __init__(
+        self,
+        years,
+        grid,
+        tender_value,
+        decline_value,
+        committed_value,
+        initial,
+        player_name=None,
+    ) -> None:
+        self.years = years
+        self.grid = grid
+        self.tender_value = tender_value
+        self.decline_value = decline_value
+        self.expected_value = np.maximum(tender_value, decline_value[:, None])
+        self.is_tendered = tender_value >= decline_value[:, None]
+        self.committed_value = committed_value
+        self.initial = initial
+        self.player_name = player_name
+
+    def __repr__(self) -> str:
+        return f"OptionValuation({len(self.years)} options: ${self.value:.1f}M)"
+
+    @property
+    def value(self) -> float:
+        """Expected value of the contract from the first option year on"""
+        return float(self.initial @ self.expected_value[0])
+
+    @property
+    def option_value(self) -> float:
+        """
+        Expected value of holding the options, over committing to tender
+        every one of them
+        """
+        return self.value - float(self.initial @ self.committed_value)
+
+    @property
+    def thresholds(self) -> np.ndarray:
+        """
+        Lowest previous season QBR from which each option is tendered, or
+        NaN if it is never tendered
+        """
+        thresholds = np.full(len(self.years), np.nan)
+        for ix, is_tendered in enumerate(self.is_tendered):
+            if is_tendered[-1]:
+                declined = np.flatnonzero(~is_tendered)
+                first = declined[-1] + 1 if len(declined) else 0
+                thresholds[ix] = self.grid[first]
+        return thresholds
+
+    def tender_thresholds(self) -> dict:
+        """Get the tender threshold of each option year, keyed by season"""
+        return {
+            int(year): float(threshold)
+            for year, threshold in zip(self.years, self.thresholds)
+        }
+
+
+def qbr_grid(lo: float = 0.0, hi: float = 100.0, step: float = 1.0) -> np.ndarray:
+    """Get the QBR lattice points from lo to hi"""
+    return np.linspace(lo, hi, int(round((hi - lo) / step)) + 1)
+
+
+def normal_cdf(x) -> np.ndarray:
+    return 0.5 * (1.0 + np.vectorize(math.erf)(np.asarray(x) / math.sqrt(2.0)))
+
+
+def tauchen(grid, means, persistence: float = 0.6, sigma: float = 10.0) -> np.ndarray:
+    """
+    Discretize an AR(1) QBR process onto grid with Tauchen's method.  QBR
+    deviates from each season's mean as dev' = persistence * dev + N(0, sigma),
+    where means[0] is the mean of the season the lattice starts from.  Returns
+    one (from QBR x to QBR) transition matrix into each following season, with
+    the tails beyond the grid's ends assigned to its end points
+    """
+    grid = np.asarray(grid, dtype=float)
+    means = np.asarray(means, dtype=float)
+    midpoints = (grid[1:] + grid[:-1]) / 2
+    transitions = []
+    for prev_mean, mean in zip(means[:-1], means[1:]):
+        cond_means = mean + persistence * (grid - prev_mean)
+        cdf = normal_cdf((midpoints[None, :] - cond_means[:, None]) / sigma)
+        cdf = np.hstack([np.zeros((len(grid), 1)), cdf, np.ones((len(grid), 1))])
+        transitions.append(np.diff(cdf, axis=1))
+    return np.array(transitions)
+
+
+def initial_distribution(grid, initial) -> np.ndarray:
+    """
+    Get a probability vector over grid from a QBR, split between its two
+    nearest grid points, or from a probability vector
+    """
+    if np.ndim(initial) == 1:
+        return np.asarray(initial, dtype=float)
+    pos = np.interp(initial, grid, np.arange(len(grid)))
+    ix = min(int(pos), len(grid) - 2)
+    dist = np.zeros(len(grid))
+    dist[ix] = ix + 1 - pos
+    dist[ix + 1] = pos - ix
+    return dist
+
+
+def value_options(
+    ct: Contract,
+    transitions,
+    grid=None,
+    initial=None,
+    prod_function=get_apy_prod_value_6_poly,
+    base_year=None,
+    inflation_rate=None,
+) -> OptionValuation:
+    """
+    Value a contract's options by backward induction over a QBR lattice.
+    transitions is a (from QBR x to QBR) matrix, or one per season from the
+    first option year on, e.g. from tauchen.  Before each option year the
+    option is tendered if the expected value of the rest of the contract is
+    at least that of declining it, paying its dead cap.  initial is the QBR,
+    or distribution over grid, of the season before the first option year;
+    for a ContractEvaluation it defaults to that season's production
+    """
+    grid = qbr_grid() if grid is None else np.asarray(grid, dtype=float)
+    option_ixs = [
+        ix
+        for ix, contract_season in enumerate(ct.seasons)
+        if contract_season.is_option_year
+    ]
+    if not option_ixs:
+        raise ValueError("Contract has no option years")
+    seasons = ct.seasons[option_ixs[0] :]
+    n_seasons = len(seasons)
+    transitions = np.asarray(transitions, dtype=float)
+    if transitions.ndim == 2:
+        transitions = np.broadcast_to(transitions, (n_seasons,) + transitions.shape)
+    if transitions.shape != (n_seasons, len(grid), len(grid)):
+        raise ValueError(
+            f"Expected {n_seasons} transition matrices of {len(grid)} QBR "
+            f"grid points, got shape {transitions.shape}"
+        )
+    if initial is None:
+        if not option_ixs[0] or not getattr(ct, "productions", None):
+            raise ValueError("An initial QBR is required")
+        initial = ct.productions[option_ixs[0] - 1]
+
+    # Season values on the lattice, with options tendered or after a decline
+    prod_function = get_model(prod_function)
+    years = np.array([contract_season.year for contract_season in seasons])
+    market_salaries, inflation_adj = market_value(
+        grid[None, :],
+        years[:, None],
+        prod_function,
+        base_year=base_year,
+        inflation_rate=inflation_rate,
+    )
+    zero_market_salaries = prod_function(0.0) * np.ravel(inflation_adj)
+    tendered_vals = np.empty((n_seasons, len(grid)))
+    declined_vals = np.empty(n_seasons)
+    for ix, contract_season in enumerate(seasons):
+        if contract_season.is_void_year:
+            tendered_vals[ix] = -contract_season.void_dead_cap
+            declined_vals[ix] = -contract_season.void_dead_cap
+        elif contract_season.is_option_year:
+            tendered_vals[ix] = market_salaries[ix] - contract_season.option_salary
+            declined_vals[ix] = -contract_season.salary
+        else:
+            tendered_vals[ix] = market_salaries[ix] - contract_season.salary
+            declined_vals[ix] = zero_market_salaries[ix] - contract_season.salary
+    declined_after = np.cumsum(declined_vals[::-1])[::-1] - declined_vals
+
+    # Backward induction, from the end of the contract to the first option year
+    option_years = []
+    tender_value = []
+    decline_value = []
+    expected_val = np.zeros(len(grid))
+    committed_val = np.zeros(len(grid))
+    for ix in range(n_seasons - 1, -1, -1):
+        contract_season = seasons[ix]
+        tender_val = transitions[ix] @ (tendered_vals[ix] + expected_val)
+        committed_val = transitions[ix] @ (tendered_vals[ix] + committed_val)
+        if contract_season.is_option_year and not contract_season.is_void_year:
+            decline_val = declined_after[ix] - contract_season.option_dead_cap
+            option_years.append(contract_season.year)
+            tender_value.append(tender_val)
+            decline_value.append(decline_val)
+            expected_val = np.maximum(tender_val, decline_val)
+        else:
+            expected_val = tender_val
+
+    return OptionValuation(
+        np.array(option_years[::-1]),
+        grid,
+        np.array(tender_value[::-1]),
+        np.array(decline_value[::-1]),
+        committed_val,
+        initial_distribution(grid, initial),
+        getattr(ct, "player_name", None),
+    )
+
+
+def value_league_options(
+    contracts: list, transitions: list, grid=None, initials: list = None, **kwargs
+) -> list:
+    """
+    Value the options of every contract with option years, given each
+    contract's transitions (and initial QBR, if not its own production)
+    """
+    initials = [None for _ in contracts] if initials is None else initials
+    return [
+        value_options(ct, ct_transitions, grid, initial, **kwargs)
+        for ct, ct_transitions, initial in zip(contracts, transitions, initials)
+        if ct.has_option_years
+    ]
@@ -0,0 +1,144 @@
+"""
+Batch rendering of contract breakdown graphics across a pool of workers.
+
+Figures are built in the calling process and exported to PNG by worker
+processes, each of which keeps one warm Kaleido export process for all of its
+figures.  A manifest of figure hashes in the output directory lets unchanged
+graphics be skipped on the next run, and a cache.GraphicCache of graphics
+keyed by their evaluation inputs lets them skip figure building as well.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+OUTPUT_DIR = "outputs/contract_breakdowns"
+MANIFEST_NAME = ".render_manifest.json"
+
+
+def start_export_process() -> None:
+    """
+    Start a persistent Kaleido export process for this worker, so that every
+    figure after the first skips browser startup (Kaleido >= 1.0)
+    """
+    try:
+        import kaleido
+
+        kaleido.start_sync_server(silence_warnings=True)
+    except (ImportError, AttributeError):
+        pass
+
+
+def export_figures(specs: list) -> list:
+    """Export a chunk of (figure JSON, path) specs to image files"""
+    import plotly.io as pio
+
+    figs = [json.loads(fig_json) for fig_json, _ in specs]
+    paths = [path for _, path in specs]
+    if hasattr(pio, "write_images"):
+        pio.write_images(figs, paths)
+    else:
+        for fig, path in zip(figs, paths):
+            pio.write_image(fig, path)
+    return paths
+
+
+def figure_hash(fig_json: str) -> str:
+    return hashlib.sha256(fig_json.encode()).hexdigest()
+
+
+def load_manifest(output_dir: str) -> dict:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict, output_dir: str) -> None:
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def render_figures(
+    figs: list,
+    paths: list,
+    max_workers: int = None,
+    chunk_size: int = 8,
+    force: bool = False,
+) -> list:
+    """
+    Export figures to the given image paths across a worker pool, skipping
+    any whose figure is unchanged since it was last rendered to that path.
+    Returns the paths that were rendered
+    """
+    output_dirs = {os.path.dirname(path) or "." for path in paths}
+    manifests = {}
+    for output_dir in output_dirs:
+        os.makedirs(output_dir, exist_ok=True)
+        manifests[output_dir] = load_manifest(output_dir)
+
+    specs, hashes = [], {}
+    for fig, path in zip(figs, paths):
+        fig_json = fig if isinstance(fig, str) else fig.to_json()
+        fig_hash = figure_hash(fig_json)
+        manifest = manifests[os.path.dirname(path) or "."]
+        if not force and manifest.get(os.path.basename(path)) == fig_hash:
+            if os.path.exists(path):
+                continue
+        specs.append((fig_json, path))
+        hashes[path] = fig_hash
+    chunks = [specs[ix : ix + chunk_size] for ix in range(0, len(specs), chunk_size)]
+
+    rendered = []
+    try:
+        if chunks:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=start_export_process
+            ) as pool:
+                for chunk_paths in pool.map(export_figures, chunks):
+                    for path in chunk_paths:
+                        manifest = manifests[os.path.dirname(path) or "."]
+                        manifest[os.path.basename(path)] = hashes[path]
+                    rendered.extend(chunk_paths)
+    finally:
+        # Record whatever was rendered, even if a later chunk failed
+        for output_dir, manifest in manifests.items():
+            save_manifest(manifest, output_dir)
+    return rendered
+
+
+def render_surplus_value_graphics(
+    evaluations: list,
+    output_dir: str = OUTPUT_DIR,
+    max_workers: int = None,
+    chunk_size: int = 8,
+    force: bool = False,
+    cache=None,
+) -> list:
+    """
+    Render the surplus value breakdown graphic of every ContractEvaluation
+    to {output_dir}/{player_name}.png across a worker pool, skipping graphics
+    that are unchanged.  With a cache.GraphicCache, graphics whose inputs are
+    cached are copied from the cache without building their figures.  Returns
+    the paths that were rendered
+    """
+    from cache import graphic_key
+
+    figs, paths, keys = [], [], {}
+    for eval_ct in evaluations:
+        path = os.path.join(output_dir, f"{eval_ct.player_name}.png")
+        if cache is not None:
+            key = graphic_key(eval_ct)
+            if not force and cache.get(key, path) is not None:
+                continue
+            keys[path] = key
+        figs.append(eval_ct.build_surplus_value_figure())
+        paths.append(path)
+    rendered = render_figures(figs, paths, max_workers, chunk_size, force)
+    if cache is not None:
+        for path in paths:
+            if os.path.exists(path):
+                cache.put(keys[path], path)
+    return rendered
@@ -0,0 +1,193 @@
+"""
+Evaluate a league's worth of contracts across a process pool.
+
+    python runner.py contracts/ --productions productions.json --output results.csv
+
+Contracts are read from a JSON file, or a directory of JSON files, each
+holding one contract or a list of contracts of the form
+
+    {"player_name": "Trevor Lawrence", "seasons": [...], "productions": [...]}
+
+where "seasons" is a list of records as accepted by Contract.from_records.
+Productions may instead (or also) be given in a separate JSON file mapping
+player names to production lists.  Large .jsonl or .csv files of season
+records are streamed in chunks instead (see ingest.py).
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contract import Contract
+from batch import evaluate_contracts
+
+RESULT_COLUMNS = [
+    "player_name",
+    "start_year",
+    "end_year",
+    "surplus_value",
+    "market_value",
+    "total_value",
+    "option_years_tendered",
+    "option_years_declined",
+]
+
+
+def load_contracts(path: str) -> list:
+    """Load contract entries from a JSON file or a directory of JSON files"""
+    if os.path.isdir(path):
+        paths = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.endswith(".json")
+        )
+    else:
+        paths = [path]
+    entries = []
+    for file_path in paths:
+        with open(file_path) as f:
+            data = json.load(f)
+        entries.extend(data if isinstance(data, list) else [data])
+    return entries
+
+
+def attach_productions(entries: list, productions: dict = None) -> list:
+    """Attach production projections to contract entries by player name"""
+    productions = productions or {}
+    for entry in entries:
+        player_name = entry.get("player_name")
+        if player_name in productions:
+            entry["productions"] = productions[player_name]
+        if entry.get("productions") is None:
+            raise ValueError(f"No productions found for {player_name}")
+    return entries
+
+
+def evaluate_chunk(entries: list, prod_function="6_poly") -> list:
+    """Evaluate a chunk of contract entries in one batch, returning result rows"""
+    contracts = [Contract().from_records(entry["seasons"]) for entry in entries]
+    result = evaluate_contracts(
+        contracts, [entry["productions"] for entry in entries], prod_function
+    )
+    rows = []
+    for ix, (entry, ct) in enumerate(zip(entries, contracts)):
+        tendered, declined = [], []
+        for jx, (year, contract_season) in enumerate(ct):
+            if contract_season.is_option_year:
+                is_tendered = result.is_option_tendered[ix, jx]
+                (tendered if is_tendered else declined).append(str(year))
+        rows.append(
+            {
+                "player_name": entry.get("player_name"),
+                "start_year": ct[0].year,
+                "end_year": ct[-1].year,
+                "surplus_value": float(result.surplus_value[ix]),
+                "market_value": float(result.market_value[ix]),
+                "total_value": float(result.total_value[ix]),
+                "option_years_tendered": " ".join(tendered),
+                "option_years_declined": " ".join(declined),
+            }
+        )
+    return rows
+
+
+def chunked(entries: list, chunk_size: int) -> list:
+    return [entries[ix : ix + chunk_size] for ix in range(0, len(entries), chunk_size)]
+
+
+def run_chunks(chunks, workers: int = None, prod_function="6_poly"):
+    """
+    Evaluate an iterable of chunks of contract entries across a pool of worker
+    processes, lazily yielding result rows in order.  At most two chunks per
+    worker are in flight, so chunks can be streamed from disk
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk, prod_function)
+        return
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(evaluate_chunk, chunk, prod_function))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def run(
+    entries: list,
+    workers: int = None,
+    chunk_size: int = 256,
+    prod_function="6_poly",
+) -> list:
+    """Evaluate contract entries in chunks across a pool of worker processes"""
+    chunks = chunked(entries, chunk_size)
+    if len(chunks) <= 1:
+        workers = 1
+    return list(run_chunks(chunks, workers, prod_function))
+
+
+def write_results(rows, path: str) -> int:
+    """Write result rows, which may be a lazy iterable, returning the count"""
+    n_rows = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            n_rows += 1
+    return n_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Evaluate QB contracts across a process pool"
+    )
+    parser.add_argument(
+        "contracts",
+        help="JSON file or directory of JSON files, or a .jsonl or .csv file of "
+        "season records",
+    )
+    parser.add_argument(
+        "--productions", help="JSON file mapping player names to productions"
+    )
+    parser.add_argument("--output", default="results.csv", help="Output CSV path")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--prod-function", default="6_poly", help="Value model name")
+    args = parser.parse_args(argv)
+
+    productions = None
+    if args.productions:
+        with open(args.productions) as f:
+            productions = json.load(f)
+
+    start = time.perf_counter()
+    if args.contracts.endswith((".jsonl", ".csv")):
+        from ingest import chunk_entries, read_contracts
+
+        chunks = (
+            attach_productions(chunk, productions)
+            for chunk in chunk_entries(read_contracts(args.contracts), args.chunk_size)
+        )
+        rows = run_chunks(chunks, args.workers, args.prod_function)
+    else:
+        entries = attach_productions(load_contracts(args.contracts), productions)
+        rows = run(entries, args.workers, args.chunk_size, args.prod_function)
+    n_rows = write_results(rows, args.output)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Evaluated {n_rows} contracts in {elapsed:.2f}s "
+        f"({n_rows / max(elapsed, 1e-9):,.0f} contracts/sec) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from batch import BatchEvaluation, evaluate_batch, pack_contracts
+import utils
+from value import get_model
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ScenarioResult:
+    """
+    Evaluation of a batch of contracts under a grid of scenarios.  Every
+    combination of value model, inflation rate and base year is one scenario,
+    labeled by the models, inflation_rates and base_years arrays.  Aggregates
+    have (contract x scenario) shape and per-season matrices have
+    (contract x scenario x season) shape
+    """
+
+    models: np.ndarray
+    inflation_rates: np.ndarray
+    base_years: np.ndarray
+    years: np.ndarray
+    evaluation: BatchEvaluation
+
+    def __init__(self, models, inflation_rates, base_years, years, evaluation) -> None:
+        self.models = np.asarray(models)
+        self.inflation_rates = np.asarray(inflation_rates, dtype=float)
+        self.base_years = np.asarray(base_years)
+        self.years = years
+        self.evaluation = evaluation
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __repr__(self) -> str:
+        return f"ScenarioResult({self.evaluation.season_surplus_value.shape})"
+
+    @property
+    def surplus_value(self) -> np.ndarray:
+        return self.evaluation.surplus_value
+
+    @property
+    def market_value(self) -> np.ndarray:
+        return self.evaluation.market_value
+
+    @property
+    def total_value(self) -> np.ndarray:
+        return self.evaluation.total_value
+
+    def scenario_index(
+        self, model, inflation_rate: float = None, base_year: int = None
+    ) -> int:
+        """
+        Get the scenario axis index of a model, inflation rate and base year,
+        by default utils.INFLATION_RATE and utils.BASE_YEAR
+        """
+        if inflation_rate is None:
+            inflation_rate = utils.INFLATION_RATE
+        if base_year is None:
+            base_year = utils.BASE_YEAR
+        is_scenario = (
+            (self.models == model_name(model))
+            & np.isclose(self.inflation_rates, inflation_rate)
+            & (self.base_years == base_year)
+        )
+        if not is_scenario.any():
+            raise KeyError(f"No scenario ({model}, {inflation_rate}, {base_year})")
+        return int(np.argmax(is_scenario))
+
+    def to_df(self, player_names: list = None) -> "pd.DataFrame":
+        """Get aggregates as a long DataFrame with one row per contract and scenario"""
+        import pandas as pd
+
+        n_contracts, n_scenarios = self.surplus_value.shape
+        contracts = (
+            np.arange(n_contracts) if player_names is None else np.asarray(player_names)
+        )
+        return pd.DataFrame(
+            {
+                "contract": np.repeat(contracts, n_scenarios),
+                "model": np.tile(self.models, n_contracts),
+                "inflation_rate": np.tile(self.inflation_rates, n_contracts),
+                "base_year": np.tile(self.base_years, n_contracts),
+                "surplus_value": self.surplus_value.ravel(),
+                "market_value": self.market_value.ravel(),
+                "total_value": self.total_value.ravel(),
+            }
+        )
+
+
+def model_name(prod_function) -> str:
+    if type(prod_function) is str:
+        return prod_function
+    return get_model(prod_function).__name__
+
+
+def scenario_axis(arr) -> np.ndarray:
+    """Insert a scenario axis before the season axis of a per-season input"""
+    arr = np.asarray(arr, dtype=float)
+    return arr if arr.ndim == 0 else arr[..., None, :]
+
+
+def sweep_scenarios(
+    years,
+    salaries,
+    productions,
+    option_salaries=np.nan,
+    option_dead_caps=np.nan,
+    void_dead_caps=np.nan,
+    inflation_rates=None,
+    base_years=None,
+    prod_functions=("6_poly",),
+) -> ScenarioResult:
+    """
+    Evaluate N contracts x M seasons, taking inputs as evaluate_batch does,
+    under every combination of value model, inflation rate and base year.
+    Inflation rates and base years are broadcast along a scenario axis, so
+    each model is a single vectorized evaluation.  They default to
+    utils.INFLATION_RATE and utils.BASE_YEAR
+    """
+    if inflation_rates is None:
+        inflation_rates = (utils.INFLATION_RATE,)
+    if base_years is None:
+        base_years = (utils.BASE_YEAR,)
+    inflation_rates = np.asarray(inflation_rates, dtype=float)
+    base_years = np.asarray(base_years)
+    rate_grid, base_year_grid = (
+        grid.ravel() for grid in np.meshgrid(inflation_rates, base_years, indexing="ij")
+    )
+
+    # Seasons on the last axis, scenarios on the axis before it
+    (
+        years,
+        salaries,
+        productions,
+        option_salaries,
+        option_dead_caps,
+        void_dead_caps,
+    ) = (
+        scenario_axis(arr)
+        for arr in (
+            years,
+            salaries,
+            productions,
+            option_salaries,
+            option_dead_caps,
+            void_dead_caps,
+        )
+    )
+
+    evaluations = [
+        evaluate_batch(
+            years,
+            salaries,
+            productions,
+            option_salaries,
+            option_dead_caps,
+            void_dead_caps,
+            prod_function,
+            base_year=base_year_grid[:, None],
+            inflation_rate=rate_grid[:, None],
+        )
+        for prod_function in prod_functions
+    ]
+    valid = ~np.isnan(years)
+    evaluation = BatchEvaluation(
+        *(
+            np.concatenate(
+                [
+                    np.broadcast_to(getattr(result, name), result.market_salary.shape)
+                    for result in evaluations
+                ],
+                axis=-2,
+            )
+            for name in (
+                "production",
+                "inflation_adj",
+                "market_salary",
+                "actual_salary",
+                "season_surplus_value",
+                "is_option_tendered",
+            )
+        ),
+        valid,
+    )
+    n_grid = len(rate_grid)
+    return ScenarioResult(
+        np.repeat(
+            [model_name(prod_function) for prod_function in prod_functions], n_grid
+        ),
+        np.tile(rate_grid, len(prod_functions)),
+        np.tile(base_year_grid, len(prod_functions)),
+        years[..., 0, :],
+        evaluation,
+    )
+
+
+def sweep_contracts(
+    contracts: list,
+    productions: list,
+    inflation_rates=None,
+    base_years=None,
+    prod_functions=("6_poly",),
+) -> ScenarioResult:
+    """Evaluate a list of Contracts under a grid of scenarios"""
+    packed = pack_contracts(contracts, productions)
+    return sweep_scenarios(
+        **packed,
+        inflation_rates=inflation_rates,
+        base_years=base_years,
+        prod_functions=prod_functions,
+    )
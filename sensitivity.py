@@ -0,0 +1,123 @@
+import numpy as np
+from batch import evaluate_batch, pack_contracts
+import utils
+from value import get_apy_prod_value_6_poly, get_derivative
+
+
+class SensitivityResult:
+    """
+    Sensitivity of surplus value to each season's QBR and to the salary cap
+    inflation rate, for a batch of contracts.  Per-season matrices have the
+    (contract x season) shape of the inputs with NaN in padded seasons.
+    Option decisions are held at those of the evaluated productions, so these
+    are the derivatives within the current option regime
+    """
+
+    years: np.ndarray
+    production: np.ndarray
+    inflation_rate: np.ndarray
+    evaluation = None
+
+    def __init__(self, years, production, inflation_rate, evaluation) -> None:
+        self.years = years
+        self.production = production
+        self.inflation_rate = inflation_rate
+        self.evaluation = evaluation
+
+    def __len__(self) -> int:
+        return len(self.production)
+
+    def __repr__(self) -> str:
+        return f"SensitivityResult({self.production.shape})"
+
+    @property
+    def total_inflation_rate(self) -> np.ndarray:
+        """d(surplus value) / d(inflation rate) of each contract"""
+        return np.nansum(self.inflation_rate, axis=-1)
+
+    @property
+    def most_sensitive_years(self) -> np.ndarray:
+        """Season of each contract whose QBR moves surplus value the most"""
+        abs_production = np.nan_to_num(np.abs(self.production), nan=-1.0)
+        ix = np.argmax(abs_production, axis=-1)
+        return np.take_along_axis(self.years, ix[..., None], axis=-1)[..., 0]
+
+    def season_sensitivities(self, ix: int) -> dict:
+        """Get {year: (d/dQBR, d/d inflation rate)} for one contract"""
+        return {
+            int(year): (float(d_prod), float(d_rate))
+            for year, d_prod, d_rate in zip(
+                self.years[ix], self.production[ix], self.inflation_rate[ix]
+            )
+            if not np.isnan(year)
+        }
+
+
+def sensitivity_batch(
+    years,
+    salaries,
+    productions,
+    option_salaries=np.nan,
+    option_dead_caps=np.nan,
+    void_dead_caps=np.nan,
+    prod_function=get_apy_prod_value_6_poly,
+) -> SensitivityResult:
+    """
+    Get d(surplus value)/d(QBR) of every season and d(surplus value)/d(inflation
+    rate) of every season for N contracts x M seasons at once, taking inputs
+    as evaluate_batch does.  QBR derivatives use the analytic derivative of
+    the production value model
+    """
+    evaluation = evaluate_batch(
+        years,
+        salaries,
+        productions,
+        option_salaries,
+        option_dead_caps,
+        void_dead_caps,
+        prod_function,
+    )
+    years, productions = np.broadcast_arrays(
+        np.asarray(years, dtype=float), np.asarray(productions, dtype=float)
+    )
+    valid = ~np.isnan(years)
+
+    # Seasons valued at their own production: not void, and not at or after a
+    # declined option.  Everything else has a fixed market salary
+    is_option_year = np.broadcast_to(~np.isnan(option_salaries), years.shape)
+    is_void_year = np.broadcast_to(~np.isnan(void_dead_caps), years.shape)
+    is_declined = is_option_year & valid & ~evaluation.is_option_tendered
+    after_decline = np.cumsum(is_declined, axis=-1)
+    is_produced = valid & ~is_void_year & (after_decline == 0)
+    derivative = get_derivative(prod_function)
+    d_production = np.where(
+        is_produced, derivative(productions) * evaluation.inflation_adj, 0.0
+    )
+
+    # Market salaries scale with inflation_rate**season_offset
+    season_offset = years - utils.BASE_YEAR
+    d_inflation_rate = evaluation.market_salary * season_offset / utils.INFLATION_RATE
+
+    return SensitivityResult(
+        years,
+        np.where(valid, d_production, np.nan),
+        np.where(valid, d_inflation_rate, np.nan),
+        evaluation,
+    )
+
+
+def find_sensitivities(
+    contracts: list, productions: list, prod_function=get_apy_prod_value_6_poly
+) -> SensitivityResult:
+    """Get the surplus value sensitivities of a list of Contracts in one pass"""
+    packed = pack_contracts(contracts, productions)
+    return sensitivity_batch(**packed, prod_function=prod_function)
+
+
+def find_sensitivity(eval_ct) -> dict:
+    """
+    Get {year: (d/dQBR, d/d inflation rate)} of surplus value for a single
+    ContractEvaluation
+    """
+    result = find_sensitivities([eval_ct], [eval_ct.productions], eval_ct.prod_function)
+    return result.season_sensitivities(0)
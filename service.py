@@ -0,0 +1,319 @@
+"""
+Asyncio HTTP service for contract evaluations.
+
+    python service.py --port 8080 --max-batch-size 256 --max-latency-ms 5
+
+Endpoints take a JSON body and return JSON:
+
+    POST /evaluate   {"seasons": [...], "productions": [...], "player_name": ...}
+    POST /breakeven  {"seasons": [...]}
+    GET  /health
+
+where "seasons" are records as accepted by Contract.from_records, and either
+endpoint accepts an optional "prod_function" model name.  Concurrent requests
+are micro-batched: each endpoint collects requests for up to the latency
+window (or until the batch is full) and evaluates them in one vectorized call.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+from contract import Contract
+from compare import find_breakeven_points
+from runner import evaluate_chunk
+from value import PRODUCTION_VALUE_MODELS
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+
+
+class MicroBatcher:
+    """
+    Collects concurrently submitted items into batches of at most
+    max_batch_size, waiting at most max_latency seconds after the first item
+    of a batch, and runs handler on each batch in a worker thread.  handler
+    takes a list of items and returns a list of results in the same order
+    """
+
+    max_batch_size: int
+    max_latency: float
+    n_batches: int = 0
+    n_items: int = 0
+
+    def __init__(
+        self, handler, max_batch_size: int = 256, max_latency: float = 0.005
+    ) -> None:
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.queue = None
+        self.task = None
+
+    def start(self) -> None:
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def submit(self, item):
+        """Submit an item and wait for its result"""
+        if self.task is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def next_batch(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.handler, items)
+            except Exception:
+                # Retry one at a time, so only the items that fail get errors
+                results = await loop.run_in_executor(None, self.handle_each, items)
+            self.n_batches += 1
+            self.n_items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def handle_each(self, items: list) -> list:
+        """Run handler on each item alone, returning the exception of any that fail"""
+        results = []
+        for item in items:
+            try:
+                results.append(self.handler([item])[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+
+def group_by_model(entries: list) -> dict:
+    """Get the indices of entries by their value model"""
+    groups = {}
+    for ix, entry in enumerate(entries):
+        groups.setdefault(entry.get("prod_function", "6_poly"), []).append(ix)
+    return groups
+
+
+def evaluate_entries(entries: list) -> list:
+    """Evaluate a batch of request entries, one vectorized call per value model"""
+    results = [None for _ in entries]
+    for prod_function, ixs in group_by_model(entries).items():
+        rows = evaluate_chunk([entries[ix] for ix in ixs], prod_function)
+        for ix, row in zip(ixs, rows):
+            results[ix] = row
+    return results
+
+
+def breakeven_entries(entries: list) -> list:
+    """Find the breakeven points of a batch of request entries"""
+    results = [None for _ in entries]
+    for prod_function, ixs in group_by_model(entries).items():
+        contracts = [Contract().from_records(entries[ix]["seasons"]) for ix in ixs]
+        breakevens = find_breakeven_points(contracts, prod_function)
+        for jx, ix in enumerate(ixs):
+            point = float(breakevens[jx])
+            results[ix] = {
+                "player_name": entries[ix].get("player_name"),
+                "breakeven_point": None if math.isnan(point) else point,
+                "option_regime": breakevens.option_regime(jx),
+            }
+    return results
+
+
+def is_number(val) -> bool:
+    """Check that a JSON value is a finite number"""
+    return type(val) in (int, float) and math.isfinite(val)
+
+
+def validate_season(record) -> None:
+    """Raise a ValueError describing the first problem with a season record"""
+    if not isinstance(record, dict):
+        raise ValueError("Season records must be JSON objects")
+    if type(record.get("year")) is not int:
+        raise ValueError("Season 'year' must be an integer")
+    required = ["salary"]
+    if record.get("is_option_year"):
+        required += ["option_salary", "option_dead_cap"]
+    if record.get("is_void_year"):
+        required.append("void_dead_cap")
+    for name in ("salary", "option_salary", "option_dead_cap", "void_dead_cap"):
+        val = record.get(name)
+        if (val is not None or name in required) and not is_number(val):
+            raise ValueError(f"{record['year']} '{name}' must be a finite number")
+
+
+def validate_entry(entry, needs_productions: bool) -> None:
+    """Raise a ValueError describing the first problem with a request body"""
+    if not isinstance(entry, dict):
+        raise ValueError("Request body must be a JSON object")
+    if not isinstance(entry.get("seasons"), list) or not entry["seasons"]:
+        raise ValueError("'seasons' must be a non-empty list of season records")
+    for record in entry["seasons"]:
+        validate_season(record)
+    try:
+        ct = Contract().from_records(entry["seasons"])
+    except TypeError as exc:
+        raise ValueError(f"Invalid season record: {exc}")
+    prod_function = entry.get("prod_function", "6_poly")
+    if not isinstance(prod_function, str):
+        raise ValueError("'prod_function' must be the name of a value model")
+    if prod_function not in PRODUCTION_VALUE_MODELS:
+        raise ValueError(f"Unknown production value model: {prod_function}")
+    if needs_productions:
+        productions = entry.get("productions")
+        if not isinstance(productions, list) or len(productions) < len(ct.seasons):
+            raise ValueError("'productions' must have one value per season")
+        if not all(is_number(prod) for prod in productions[: len(ct.seasons)]):
+            raise ValueError("'productions' must be finite numbers")
+
+
+class EvaluationService:
+    """HTTP service routing requests to a MicroBatcher per endpoint"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch_size: int = 256,
+        max_latency: float = 0.005,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.batchers = {
+            "/evaluate": MicroBatcher(evaluate_entries, max_batch_size, max_latency),
+            "/breakeven": MicroBatcher(breakeven_entries, max_batch_size, max_latency),
+        }
+        self.server = None
+
+    async def start(self) -> None:
+        # Peak load arrives as bursts of new connections
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, backlog=4096
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        for batcher in self.batchers.values():
+            batcher.start()
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"Serving on http://{self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def respond(self, method: str, path: str, body: bytes) -> tuple:
+        """Get the status and JSON response to a request"""
+        if method == "GET" and path == "/health":
+            return 200, {
+                "status": "ok",
+                "batches": {
+                    name: {"batches": batcher.n_batches, "requests": batcher.n_items}
+                    for name, batcher in self.batchers.items()
+                },
+            }
+        batcher = self.batchers.get(path)
+        if method != "POST" or batcher is None:
+            return 404, {"error": f"No endpoint {method} {path}"}
+        try:
+            entry = json.loads(body or b"null")
+            validate_entry(entry, needs_productions=path == "/evaluate")
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        try:
+            return 200, await batcher.submit(entry)
+        except Exception as exc:
+            return 500, {"error": str(exc)}
+
+    async def handle_connection(self, reader, writer) -> None:
+        """Serve HTTP/1.1 requests on a connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, val = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = val.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, response = await self.respond(method, path, body)
+                payload = json.dumps(response).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve QB contract evaluations")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument(
+        "--max-latency-ms", type=float, default=5.0, help="Batching window"
+    )
+    args = parser.parse_args(argv)
+    service = EvaluationService(
+        args.host, args.port, args.max_batch_size, args.max_latency_ms / 1000
+    )
+    asyncio.run(service.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
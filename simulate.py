@@ -0,0 +1,133 @@
+import numpy as np
+from contract import Contract
+from value import get_apy_prod_value_6_poly
+from batch import pack_contracts, evaluate_batch
+
+
+class SimulationResult:
+    """
+    Distribution of a contract's value over simulated production paths
+    """
+
+    years: np.ndarray
+    surplus_values: np.ndarray
+    option_tender_probability: np.ndarray
+    player_name: str = None
+
+    def __init__(
+        self,
+        years,
+        surplus_values,
+        is_option_tendered,
+        is_option_year,
+        player_name=None,
+    ) -> None:
+        self.years = years
+        self.surplus_values = surplus_values
+        self.option_tender_probability = np.where(
+            is_option_year, is_option_tendered.mean(axis=0), np.nan
+        )
+        self.player_name = player_name
+
+    def __repr__(self) -> str:
+        return f"SimulationResult({len(self.surplus_values)} paths: ${self.mean:.1f}M)"
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(self.surplus_values))
+
+    @property
+    def std(self) -> float:
+        return float(np.std(self.surplus_values))
+
+    def percentiles(self, q=(5, 25, 50, 75, 95)) -> dict:
+        """Get surplus value percentiles, keyed by percentile"""
+        return dict(zip(q, np.percentile(self.surplus_values, q)))
+
+    def tender_probabilities(self) -> dict:
+        """Get the probability each option year is tendered, keyed by season"""
+        return {
+            int(year): float(prob)
+            for year, prob in zip(self.years, self.option_tender_probability)
+            if not np.isnan(prob)
+        }
+
+
+def correlation_matrix(n_seasons: int, correlation=0.0) -> np.ndarray:
+    """
+    Build a season x season correlation matrix.  A scalar correlation is the
+    year-to-year correlation, decaying geometrically with the gap between seasons
+    """
+    if np.ndim(correlation) == 2:
+        return np.asarray(correlation, dtype=float)
+    gaps = np.abs(np.subtract.outer(np.arange(n_seasons), np.arange(n_seasons)))
+    return float(correlation) ** gaps
+
+
+def simulate_productions(
+    means, variances, n_paths: int, correlation=0.0, seed=None
+) -> np.ndarray:
+    """
+    Draw production paths (paths x seasons) from per-season normal QBR
+    distributions with the given year-to-year correlation, clipped to [0, 100]
+    """
+    means = np.asarray(means, dtype=float)
+    stds = np.sqrt(np.asarray(variances, dtype=float))
+    rng = np.random.default_rng(seed)
+    corr = correlation_matrix(len(means), correlation)
+    # Small jitter keeps perfectly correlated seasons factorizable
+    chol = np.linalg.cholesky(corr + np.eye(len(means)) * 1e-12)
+    draws = rng.standard_normal((n_paths, len(means))) @ chol.T
+    return np.clip(means + draws * stds, 0.0, 100.0)
+
+
+def simulate_contract(
+    ct: Contract,
+    means=None,
+    variances=0.0,
+    n_paths: int = 10000,
+    correlation=0.0,
+    seed=None,
+    prod_function=get_apy_prod_value_6_poly,
+) -> SimulationResult:
+    """
+    Evaluate a contract over simulated production paths in one vectorized
+    pass.  If no means are given, a ContractEvaluation's productions are used
+    """
+    if means is None:
+        means = ct.productions
+    variances = np.broadcast_to(np.asarray(variances, dtype=float), np.shape(means))
+    productions = simulate_productions(means, variances, n_paths, correlation, seed)
+    packed = pack_contracts([ct])
+    result = evaluate_batch(
+        **packed, productions=productions, prod_function=prod_function
+    )
+    return SimulationResult(
+        packed["years"][0],
+        result.surplus_value,
+        result.is_option_tendered,
+        ~np.isnan(packed["option_salaries"][0]),
+        getattr(ct, "player_name", None),
+    )
+
+
+def simulate_contracts(
+    contracts: list,
+    means: list,
+    variances: list,
+    n_paths: int = 10000,
+    correlation=0.0,
+    seed=None,
+    prod_function=get_apy_prod_value_6_poly,
+) -> list:
+    """
+    Simulate every contract in a league.  Each contract is evaluated over all
+    of its paths at once, so memory scales with paths x seasons, not league size
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        simulate_contract(
+            ct, ct_means, ct_variances, n_paths, correlation, rng, prod_function
+        )
+        for ct, ct_means, ct_variances in zip(contracts, means, variances)
+    ]
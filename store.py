@@ -0,0 +1,175 @@
+"""
+Columnar on-disk storage of contract tables and batch evaluations.
+
+Each is saved as a directory holding one .npy file per column and a
+meta.json, and loaded back memory-mapped, so loading is zero-copy and takes
+milliseconds regardless of size.  Contract tables can also be saved to and
+loaded from Parquet files when pyarrow is installed.
+"""
+
+import json
+import os
+import numpy as np
+
+FORMAT_VERSION = 1
+META_NAME = "meta.json"
+
+
+def save_arrays(path: str, arrays: dict, meta: dict = None) -> None:
+    """Save named arrays to a directory of .npy files"""
+    os.makedirs(path, exist_ok=True)
+    for name, arr in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.asarray(arr), allow_pickle=False)
+    meta = {"format_version": FORMAT_VERSION, "arrays": list(arrays), **(meta or {})}
+    with open(os.path.join(path, META_NAME), "w") as f:
+        json.dump(meta, f)
+
+
+def load_arrays(path: str, mmap_mode: str = "r") -> tuple:
+    """
+    Load the named arrays and metadata of a directory saved by save_arrays,
+    memory-mapped unless mmap_mode is None
+    """
+    with open(os.path.join(path, META_NAME)) as f:
+        meta = json.load(f)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported store format: {meta.get('format_version')}")
+    arrays = {}
+    for name in meta["arrays"]:
+        arr_path = os.path.join(path, f"{name}.npy")
+        try:
+            arrays[name] = np.load(arr_path, mmap_mode=mmap_mode, allow_pickle=False)
+        except ValueError:
+            # Empty arrays can't be memory-mapped
+            arrays[name] = np.load(arr_path, allow_pickle=False)
+    return arrays, meta
+
+
+def save_parquet(path: str, columns: dict, meta: dict = None) -> None:
+    """Save equal length named columns to a Parquet file"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({name: np.asarray(col) for name, col in columns.items()})
+    meta = {"format_version": FORMAT_VERSION, **(meta or {})}
+    table = table.replace_schema_metadata({"qbce": json.dumps(meta)})
+    pq.write_table(table, path)
+
+
+def load_parquet(path: str) -> tuple:
+    """Load the named columns and metadata of a Parquet file saved by save_parquet"""
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, memory_map=True)
+    meta = json.loads(table.schema.metadata[b"qbce"])
+    columns = {name: table.column(name).to_numpy() for name in table.column_names}
+    return columns, meta
+
+
+class EvaluationSet:
+    """
+    Contracts, their productions and player names, and their batch
+    evaluation, as saved together by save_evaluations
+    """
+
+    table = None
+    productions: np.ndarray
+    evaluation = None
+    player_names: list
+    prod_function: str
+
+    def __init__(
+        self, table, productions, evaluation, player_names, prod_function
+    ) -> None:
+        self.table = table
+        self.productions = productions
+        self.evaluation = evaluation
+        self.player_names = player_names
+        self.prod_function = prod_function
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __repr__(self) -> str:
+        return f"EvaluationSet({len(self)} contracts: {self.prod_function})"
+
+    def to_evaluations(self) -> list:
+        """Rebuild unevaluated ContractEvaluations from the stored inputs"""
+        from contract import ContractEvaluation
+
+        return [
+            ContractEvaluation(
+                ct,
+                self.productions[ix, : len(ct.seasons)].tolist(),
+                self.player_names[ix],
+                self.prod_function,
+            )
+            for ix, ct in enumerate(self.table)
+        ]
+
+
+def save_evaluations(path: str, evaluations: list, result=None) -> None:
+    """
+    Save ContractEvaluations, which must share a registered value model,
+    along with their batch evaluation.  The batch evaluation is computed if
+    not given
+    """
+    from batch import evaluate_batch
+    from table import ContractTable
+    from value import PRODUCTION_VALUE_MODELS
+
+    if not evaluations:
+        raise ValueError("No evaluations to save")
+    for eval_ct in evaluations:
+        if len(eval_ct.productions) < len(eval_ct.seasons):
+            raise ValueError(
+                f"{eval_ct!r} has {len(eval_ct.productions)} productions for "
+                f"{len(eval_ct.seasons)} seasons"
+            )
+    prod_function = evaluations[0].prod_function
+    if any(eval_ct.prod_function is not prod_function for eval_ct in evaluations):
+        raise ValueError("Saved evaluations must share a value model")
+    model = PRODUCTION_VALUE_MODELS.get(prod_function.__name__)
+    if model is None or model.evaluate is not prod_function:
+        raise ValueError(
+            f"Value model {prod_function.__name__} is not registered, so it "
+            "can't be loaded back"
+        )
+    table = ContractTable.from_contracts(evaluations)
+    packed = table.to_batch()
+    productions = table.pad(
+        [
+            prod
+            for eval_ct in evaluations
+            for prod in eval_ct.productions[: len(eval_ct.seasons)]
+        ]
+    )
+    if result is None:
+        result = evaluate_batch(
+            **packed, productions=productions, prod_function=prod_function
+        )
+    table.save(os.path.join(path, "contracts"))
+    result.save(os.path.join(path, "evaluation"))
+    save_arrays(
+        path,
+        {"productions": productions},
+        {
+            "player_names": [eval_ct.player_name for eval_ct in evaluations],
+            "prod_function": prod_function.__name__,
+        },
+    )
+
+
+def load_evaluations(path: str, mmap_mode: str = "r") -> EvaluationSet:
+    """Load ContractEvaluations and their batch evaluation saved by save_evaluations"""
+    from batch import BatchEvaluation
+    from table import ContractTable
+
+    arrays, meta = load_arrays(path, mmap_mode)
+    return EvaluationSet(
+        ContractTable.load(os.path.join(path, "contracts"), mmap_mode),
+        arrays["productions"],
+        BatchEvaluation.load(os.path.join(path, "evaluation"), mmap_mode),
+        meta["player_names"],
+        meta["prod_function"],
+    )
@@ -0,0 +1,151 @@
+import numpy as np
+from contract import Contract, ContractSeason
+from store import load_arrays, load_parquet, save_arrays, save_parquet
+
+
+class ContractTable:
+    """
+    Compact struct-of-arrays store for many contracts.  Every season field is
+    one NumPy column, with each contract's seasons stored contiguously and
+    located by offsets.  Option and void fields are NaN outside option and
+    void years.  Indexing and iterating yield Contract objects.  Tables are
+    saved to and loaded from disk column-wise, see store.py
+    """
+
+    COLUMNS = {
+        "year": np.int16,
+        "salary": np.float64,
+        "option_salary": np.float64,
+        "option_dead_cap": np.float64,
+        "void_dead_cap": np.float64,
+        "is_option_year": np.bool_,
+        "is_void_year": np.bool_,
+    }
+
+    offsets: np.ndarray
+    columns: dict
+
+    def __init__(self, offsets=None, columns: dict = None) -> None:
+        self.offsets = (
+            np.zeros(1, dtype=np.int64)
+            if offsets is None
+            else np.asarray(offsets, dtype=np.int64)
+        )
+        columns = columns or {}
+        self.columns = {
+            name: np.asarray(columns.get(name, []), dtype=dtype)
+            for name, dtype in self.COLUMNS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        return (self[ix] for ix in range(len(self)))
+
+    def __getitem__(self, ix) -> Contract:
+        if ix < 0:
+            ix += len(self)
+        start, end = self.offsets[ix], self.offsets[ix + 1]
+        ct = Contract()
+        for jx in range(start, end):
+            season = self.season_record(jx)
+            if season["is_option_year"]:
+                ct.has_option_years = True
+            if season["is_void_year"]:
+                ct.has_void_years = True
+            ct.seasons.append(ContractSeason(**season))
+        ct.set_total_value()
+        return ct
+
+    def __repr__(self) -> str:
+        return f"ContractTable({len(self)} contracts, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + sum(col.nbytes for col in self.columns.values())
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def season_record(self, jx: int) -> dict:
+        """Get one season of the table as a ContractSeason record"""
+        record = {name: col[jx].item() for name, col in self.columns.items()}
+        for name in ("option_salary", "option_dead_cap", "void_dead_cap"):
+            if np.isnan(record[name]):
+                record[name] = None
+        return record
+
+    @classmethod
+    def from_contracts(cls, contracts: list):
+        """Build a table from a list of Contracts"""
+        offsets = np.zeros(len(contracts) + 1, dtype=np.int64)
+        columns = {name: [] for name in cls.COLUMNS}
+        for ix, ct in enumerate(contracts):
+            for year, contract_season in ct:
+                columns["year"].append(year)
+                columns["salary"].append(contract_season.salary)
+                columns["is_option_year"].append(bool(contract_season.is_option_year))
+                columns["is_void_year"].append(bool(contract_season.is_void_year))
+                for name in ("option_salary", "option_dead_cap", "void_dead_cap"):
+                    val = getattr(contract_season, name)
+                    columns[name].append(np.nan if val is None else val)
+            offsets[ix + 1] = offsets[ix] + len(ct.seasons)
+        return cls(offsets, columns)
+
+    def pad(self, column, fill=np.nan) -> np.ndarray:
+        """
+        Lay out a per-season column (aligned with the table's seasons) as a
+        padded (contract x season) array
+        """
+        lengths = self.lengths
+        rows = np.repeat(np.arange(len(self)), lengths)
+        cols = np.arange(self.offsets[-1]) - np.repeat(self.offsets[:-1], lengths)
+        padded = np.full((len(self), lengths.max(initial=0)), fill, dtype=float)
+        padded[rows, cols] = column
+        return padded
+
+    def to_batch(self) -> dict:
+        """
+        Get padded arrays accepted as keyword arguments by
+        batch.evaluate_batch, as batch.pack_contracts does
+        """
+        cols = self.columns
+        return {
+            "years": self.pad(cols["year"]),
+            "salaries": self.pad(cols["salary"]),
+            "option_salaries": self.pad(
+                np.where(cols["is_option_year"], cols["option_salary"], np.nan)
+            ),
+            "option_dead_caps": self.pad(
+                np.where(cols["is_option_year"], cols["option_dead_cap"], np.nan)
+            ),
+            "void_dead_caps": self.pad(
+                np.where(cols["is_void_year"], cols["void_dead_cap"], np.nan)
+            ),
+        }
+
+    def save(self, path: str) -> None:
+        """Save the table to a .parquet file, or else a directory of columns"""
+        if path.endswith(".parquet"):
+            columns = {"contract": np.repeat(np.arange(len(self)), self.lengths)}
+            columns.update(self.columns)
+            save_parquet(path, columns, {"n_contracts": len(self)})
+        else:
+            save_arrays(path, {"offsets": self.offsets, **self.columns})
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = "r"):
+        """
+        Load a table saved by save.  Columns saved to a directory are
+        memory-mapped unless mmap_mode is None
+        """
+        if path.endswith(".parquet"):
+            columns, meta = load_parquet(path)
+            lengths = np.bincount(
+                columns.pop("contract"), minlength=meta["n_contracts"]
+            )
+            return cls(np.concatenate([[0], np.cumsum(lengths)]), columns)
+        arrays, _ = load_arrays(path, mmap_mode)
+        return cls(arrays.pop("offsets"), arrays)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import accessor  # noqa: F401
+from contract import Contract, ContractEvaluation
+from sample_contracts import lawrence_contract
+
+
+def void_contract() -> Contract:
+    """Regular seasons, then an option year, then a void year"""
+    records = [
+        {"year": 2024, "is_option_year": False, "is_void_year": False, "salary": 43.4},
+        {"year": 2025, "is_option_year": False, "is_void_year": False, "salary": 89.9},
+        {"year": 2026, "is_option_year": False, "is_void_year": False, "salary": 68.0},
+        {
+            "year": 2027,
+            "is_option_year": True,
+            "is_void_year": False,
+            "salary": 0.0,
+            "option_salary": 72.0,
+            "option_dead_cap": 34.0,
+        },
+        {
+            "year": 2028,
+            "is_option_year": False,
+            "is_void_year": True,
+            "salary": 0.0,
+            "void_dead_cap": 12.5,
+        },
+    ]
+    return Contract().from_records(records)
+
+
+def test_accessor_matches_contract_evaluations():
+    contracts = {
+        "Lawrence": (lawrence_contract(), [55, 70, 65, 60, 20, 20, 50, 45]),
+        "Void": (void_contract(), [70, 75, 30, 80, 0]),
+    }
+    assert contracts["Void"][0].has_void_years
+    frames = []
+    for name, (ct, productions) in contracts.items():
+        assert len(productions) == len(ct.seasons)
+        df = ct.to_df()
+        df["prod"] = productions
+        df["player"] = name
+        frames.append(df)
+    # Rows needn't be grouped or in season order
+    df = pd.concat(frames).sample(frac=1, random_state=0).reset_index(drop=True)
+
+    evaluated = df.qbce.evaluate(production_col="prod", group_col="player")
+    assert list(evaluated.index) == list(df.index)
+    assert (df["surplus_value"] == 0.0).all()
+    for name, (ct, productions) in contracts.items():
+        eval_ct = ContractEvaluation(ct, productions)
+        eval_ct.evaluate()
+        rows = evaluated[evaluated["player"] == name].sort_values("year")
+        for (_, row), season in zip(rows.iterrows(), eval_ct.seasons):
+            assert row["market_salary"] == season.market_salary
+            assert row["actual_salary"] == season.actual_salary
+            assert row["surplus_value"] == season.surplus_value
+            assert row["is_option_tendered"] == bool(season.is_option_tendered)
+        assert np.cumsum(rows["surplus_value"])[-1:].item() == eval_ct.surplus_value
@@ -0,0 +1,38 @@
+import numpy as np
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from batch import evaluate_contracts
+
+PRODUCTIONS = [
+    [56, 57, 59, 59, 57, 57, 56, 0],  # both options declined
+    [80, 80, 80, 80, 80, 80, 80, 0],  # both options tendered
+    [70, 70, 70, 70, 70, 85, 70, 0],  # first option tendered, second declined
+]
+
+
+def test_evaluate_contracts_matches_scalar():
+    contracts = [lawrence_contract() for _ in PRODUCTIONS]
+    result = evaluate_contracts(contracts, PRODUCTIONS)
+    for ix, (ct, prods) in enumerate(zip(contracts, PRODUCTIONS)):
+        eval_ct = ContractEvaluation(ct, list(prods))
+        surplus_value = eval_ct.evaluate()
+        assert result.surplus_value[ix] == surplus_value
+        assert result.market_value[ix] == eval_ct.market_value
+        assert result.total_value[ix] == eval_ct.total_value
+        for jx, (_, contract_season) in enumerate(eval_ct):
+            assert result.production[ix, jx] == contract_season.production
+            assert result.market_salary[ix, jx] == contract_season.market_salary
+            assert result.actual_salary[ix, jx] == contract_season.actual_salary
+            if contract_season.is_option_year:
+                assert (
+                    result.is_option_tendered[ix, jx]
+                    == contract_season.is_option_tendered
+                )
+
+
+def test_evaluate_contracts_pads_short_contracts():
+    contracts = [lawrence_contract(), lawrence_contract()]
+    contracts[1].seasons = contracts[1].seasons[:5]
+    result = evaluate_contracts(contracts, [PRODUCTIONS[0], PRODUCTIONS[0][:5]])
+    assert np.isnan(result.market_salary[1, 5:]).all()
+    assert result.surplus_value[1] == np.sum(result.season_surplus_value[1, :5])
@@ -0,0 +1,90 @@
+import render
+from cache import EvaluationCache, GraphicCache, evaluation_key, graphic_key
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from test_render import fake_export_figures
+
+
+def lawrence_evaluation(prods=None, player_name="Trevor Lawrence"):
+    prods = prods or [56, 57, 59, 59, 57, 57, 56, 0]
+    return ContractEvaluation(lawrence_contract(), prods, player_name)
+
+
+def test_graphic_key_tracks_inputs():
+    key = graphic_key(lawrence_evaluation())
+    assert graphic_key(lawrence_evaluation()) == key
+    assert graphic_key(lawrence_evaluation([80] * 8)) != key
+    assert graphic_key(lawrence_evaluation(player_name="QB")) != key
+    assert graphic_key(lawrence_evaluation(), style="dark") != key
+
+
+def test_graphic_cache_evicts_least_recently_used(tmp_path):
+    cache = GraphicCache(str(tmp_path / "cache"), max_bytes=20)
+    for key in ("a", "b", "c"):
+        src = tmp_path / f"{key}.png"
+        src.write_bytes(b"x" * 8)
+        cache.put(key, str(src))
+    assert "a" not in cache and "b" in cache and "c" in cache
+
+    cache.get("b")
+    src = tmp_path / "d.png"
+    src.write_bytes(b"x" * 8)
+    cache.put("d", str(src))
+    assert "c" not in cache and "b" in cache
+    assert sorted(GraphicCache(str(tmp_path / "cache")).index) == ["b", "d"]
+
+
+def test_render_copies_cached_graphics(tmp_path, monkeypatch):
+    monkeypatch.setattr(render, "export_figures", fake_export_figures)
+    cache = GraphicCache(str(tmp_path / "cache"))
+    evaluations = [lawrence_evaluation(player_name=f"QB {ix}") for ix in range(2)]
+    rendered = render.render_surplus_value_graphics(
+        evaluations, str(tmp_path / "a"), max_workers=1, cache=cache
+    )
+    assert len(rendered) == 2 and len(cache) == 2
+
+    def fail_build():
+        raise AssertionError("cached graphic was rebuilt")
+
+    for eval_ct in evaluations:
+        monkeypatch.setattr(eval_ct, "build_surplus_value_figure", fail_build)
+    rendered = render.render_surplus_value_graphics(
+        evaluations, str(tmp_path / "b"), cache=cache
+    )
+    assert rendered == []
+    assert (tmp_path / "b" / "QB 0.png").read_text() == "png"
+
+
+def test_evaluation_cache_restores_evaluations():
+    cache = EvaluationCache(maxsize=2)
+    eval_ct = lawrence_evaluation()
+    eval_ct.cache = cache
+    expected = eval_ct.evaluate()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    cached_ct = lawrence_evaluation()
+    cached_ct.cache = cache
+    assert cached_ct.evaluate() == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+    for contract_season, cached_season in zip(eval_ct.seasons, cached_ct.seasons):
+        assert cached_season.to_dict() == contract_season.to_dict()
+        assert cached_season.is_option_tendered == contract_season.is_option_tendered
+    assert str(cached_ct) == str(eval_ct)
+
+    cached_ct.set_productions([80] * 8)
+    assert len(cache) == 0
+    assert cached_ct.evaluate() == lawrence_evaluation([80] * 8).evaluate()
+    assert cache.misses == 2
+
+
+def test_evaluation_cache_evicts_least_recently_used():
+    cache = EvaluationCache(maxsize=2)
+    evaluations = [lawrence_evaluation([50 + ix] * 8) for ix in range(3)]
+    keys = [evaluation_key(eval_ct) for eval_ct in evaluations]
+    for eval_ct in evaluations[:2]:
+        eval_ct.cache = cache
+        eval_ct.evaluate()
+    assert cache.get(keys[0]) is not None
+    evaluations[2].cache = cache
+    evaluations[2].evaluate()
+    assert keys[0] in cache and keys[1] not in cache and keys[2] in cache
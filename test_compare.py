@@ -0,0 +1,48 @@
+import math
+from pytest import approx
+from contract import Contract, ContractEvaluation
+from sample_contracts import lawrence_contract
+from compare import (
+    find_breakeven_point,
+    find_breakeven_points,
+    find_option_tender_avg,
+    find_option_tender_season,
+)
+
+
+def test_find_breakeven_point_is_a_root():
+    breakeven_point = find_breakeven_point(lawrence_contract())
+    eval_ct = ContractEvaluation(lawrence_contract(), [breakeven_point] * 8)
+    assert eval_ct.evaluate() == approx(0.0, abs=1e-6)
+
+
+def test_find_breakeven_points_batch():
+    cheap_ct = Contract(2024, 2026, [1.0, 1.0], 2030, [], [], 2030, [])
+    result = find_breakeven_points([lawrence_contract(), cheap_ct])
+    assert result[0] == approx(find_breakeven_point(lawrence_contract()))
+    assert result[1] == 0.0
+    assert result.option_regime(0) == {2029: False, 2030: False}
+    assert math.isnan(
+        find_breakeven_point(Contract(2024, 2025, [500.0], 2030, [], [], 2030, []))
+    )
+
+
+def test_find_option_tender_avg_tenders_all_options():
+    tender_avg = find_option_tender_avg(lawrence_contract())
+    eval_ct = ContractEvaluation(lawrence_contract(), [tender_avg] * 8)
+    eval_ct.evaluate()
+    assert eval_ct[5].is_option_tendered and eval_ct[6].is_option_tendered
+    eval_ct.set_productions([tender_avg - 1e-6] * 8)
+    eval_ct.evaluate()
+    assert not eval_ct[6].is_option_tendered
+
+
+def test_find_option_tender_season():
+    thresholds = find_option_tender_season(lawrence_contract())
+    assert list(thresholds) == [2029, 2030]
+    assert max(thresholds.values()) == approx(
+        find_option_tender_avg(lawrence_contract())
+    )
+    assert math.isnan(
+        find_option_tender_avg(Contract(2024, 2025, [1.0], 2030, [], [], 2030, []))
+    )
@@ -0,0 +1,87 @@
+import subprocess
+import sys
+import numpy as np
+from pytest import approx
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from value import market_value
+
+
+def test_remaining_vals():
+    eval_ct = ContractEvaluation(lawrence_contract(), [70, 70, 70, 70, 70, 85, 70, 0])
+    remaining_vals = eval_ct.get_remaining_vals()
+    season_vals = []
+    for year, contract_season in eval_ct:
+        if contract_season.is_void_year:
+            season_vals.append(-contract_season.void_dead_cap)
+        else:
+            market_val, _ = market_value(contract_season.production, year)
+            salary = (
+                contract_season.option_salary
+                if contract_season.is_option_year
+                else contract_season.salary
+            )
+            season_vals.append(market_val - salary)
+    for ix in range(5, len(season_vals)):
+        assert remaining_vals[ix] == approx(sum(season_vals[ix:]))
+    assert remaining_vals[:5] == [None for _ in range(5)]
+
+
+def test_evaluate_option_decisions():
+    eval_ct = ContractEvaluation(lawrence_contract(), [70, 70, 70, 70, 70, 85, 70, 0])
+    eval_ct.evaluate()
+    assert eval_ct[5].is_option_tendered
+    assert not eval_ct[6].is_option_tendered
+    assert eval_ct[6].production == 0
+
+
+def test_evaluate_is_repeatable_after_decline():
+    eval_ct = ContractEvaluation(lawrence_contract(), [56, 57, 59, 59, 57, 57, 56, 0])
+    assert eval_ct.evaluate() == eval_ct.evaluate()
+    eval_ct.set_productions([80, 80, 80, 80, 80, 80, 80, 0])
+    eval_ct.evaluate()
+    assert eval_ct[5].is_option_tendered and eval_ct[6].is_option_tendered
+
+
+def test_update_production_matches_evaluate():
+    rng = np.random.default_rng(0)
+    eval_ct = ContractEvaluation(lawrence_contract(), [56, 57, 59, 59, 57, 57, 56, 0])
+    eval_ct.evaluate()
+    for _ in range(50):
+        ix = int(rng.integers(0, 8))
+        prod = int(rng.integers(0, 101))
+        surplus_value = eval_ct.update_production(eval_ct[ix].year, prod)
+
+        fresh_ct = ContractEvaluation(lawrence_contract(), eval_ct.productions)
+        assert surplus_value == fresh_ct.evaluate()
+        assert eval_ct.market_value == fresh_ct.market_value
+        assert eval_ct.total_value == fresh_ct.total_value
+        assert eval_ct.is_option_declined == fresh_ct.is_option_declined
+        for contract_season, fresh_season in zip(eval_ct.seasons, fresh_ct.seasons):
+            assert contract_season.to_dict() == fresh_season.to_dict()
+            assert contract_season.is_option_tendered == fresh_season.is_option_tendered
+
+
+def test_breakdown_is_generated_on_access():
+    eval_ct = ContractEvaluation(lawrence_contract(), [56, 57, 59, 59, 57, 57, 56, 0])
+    eval_ct.evaluate()
+    assert eval_ct._breakdown is None
+    assert [row["Season"] for row in eval_ct.breakdown] == list(range(2024, 2032))
+    assert eval_ct.breakdown[5]["Market Sal"] == 0.0
+
+    eval_ct.update_production(2025, 90)
+    assert eval_ct._breakdown is None
+    assert "2025" in str(eval_ct)
+    assert eval_ct.breakdown[1]["QBR"] == 90
+
+
+def test_import_does_not_load_display_dependencies():
+    code = (
+        "import sys, contract, batch, compare; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} "
+        "& {'pandas', 'plotly', 'scipy', 'tabulate'}))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == "[]"
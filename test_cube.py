@@ -0,0 +1,40 @@
+import json
+import numpy as np
+import pytest
+from pytest import approx
+from cube import ValuationCube, build_cube, get_cube
+from value import market_value
+
+
+def test_cube_matches_market_value(tmp_path):
+    path = str(tmp_path / "cube")
+    build_cube(path, ["6_poly", "exp"], range(2020, 2036))
+    cube = ValuationCube(path)
+    assert isinstance(cube.values, np.memmap)
+    assert cube.values.shape == (2, 16, 10001)
+    assert get_cube(path) is get_cube(path)
+
+    for model in ("6_poly", "exp", "pow"):
+        for prod in (0, 37.25, 56, 99.999, 100, 104.5):
+            for season in (2019, 2024, 2031):
+                value, inflation_adj = cube.market_value(prod, season, model)
+                expected = market_value(prod, season, model)
+                assert value == approx(expected[0], rel=1e-4)
+                assert inflation_adj == approx(expected[1])
+
+    prods = np.array([[56.5, 104.0], [0.0, 75.3]])
+    seasons = np.array([[2024, 2030], [2040, 2025]])
+    values, inflation_adj = cube.market_value(prods, seasons)
+    expected_values, expected_adj = market_value(prods, seasons)
+    assert values == approx(expected_values, rel=1e-4)
+    assert inflation_adj == approx(expected_adj)
+
+
+def test_cube_built_under_other_constants_is_rejected(tmp_path):
+    path = tmp_path / "cube"
+    build_cube(str(path), ["6_poly"], range(2024, 2026), step=1.0)
+    meta = json.loads((path / "meta.json").read_text())
+    meta["inflation_rate"] = 1.05
+    (path / "meta.json").write_text(json.dumps(meta))
+    with pytest.raises(ValueError, match="inflation rate 1.05"):
+        ValuationCube(str(path))
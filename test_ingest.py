@@ -0,0 +1,59 @@
+import csv
+import json
+from pytest import approx
+from ingest import read_contracts, stream_evaluations
+from runner import main, run
+from sample_contracts import lawrence_contract
+
+PRODUCTIONS = [[56, 57, 59, 59, 57, 57, 56, 0], [70] * 8, [40] * 8]
+
+
+def season_records():
+    for ix, prods in enumerate(PRODUCTIONS):
+        for record, prod in zip(lawrence_contract().to_records(), prods):
+            yield {
+                "contract_id": ix,
+                "player_name": "Trevor Lawrence",
+                **record,
+                "prod": prod,
+            }
+
+
+def expected_rows():
+    entries = [
+        {
+            "player_name": "Trevor Lawrence",
+            "seasons": lawrence_contract().to_records(),
+            "productions": prods,
+        }
+        for prods in PRODUCTIONS
+    ]
+    return run(entries, workers=1)
+
+
+def test_stream_jsonl_matches_run(tmp_path):
+    path = tmp_path / "seasons.jsonl"
+    with open(path, "w") as f:
+        for record in season_records():
+            f.write(json.dumps(record) + "\n")
+    entries = list(read_contracts(str(path)))
+    assert [entry["contract_id"] for entry in entries] == [0, 1, 2]
+    assert entries[1]["productions"] == PRODUCTIONS[1]
+    assert list(stream_evaluations(str(path), chunk_size=2)) == expected_rows()
+
+
+def test_stream_csv_from_cli(tmp_path):
+    path = tmp_path / "seasons.csv"
+    records = list(season_records())
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=records[0].keys())
+        writer.writeheader()
+        writer.writerows(records)
+    output = tmp_path / "results.csv"
+    main([str(path), "--output", str(output), "--workers", "1", "--chunk-size", "2"])
+    with open(output) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    for row, expected in zip(rows, expected_rows()):
+        assert float(row["surplus_value"]) == approx(expected["surplus_value"])
+        assert row["option_years_declined"] == expected["option_years_declined"]
@@ -0,0 +1,62 @@
+import json
+import instrument
+from compare import find_breakeven_point
+from contract import Contract, ContractEvaluation
+from sample_contracts import lawrence_contract
+
+PRODUCTIONS = [56, 57, 59, 59, 57, 57, 56, 0]
+
+
+def test_profile_records_phases(tmp_path):
+    init = Contract.__init__
+    with instrument.profile(trace=True) as prof:
+        eval_ct = ContractEvaluation(lawrence_contract(), PRODUCTIONS)
+        eval_ct.evaluate()
+        with instrument.phase("breakeven search"):
+            find_breakeven_point(lawrence_contract())
+    assert Contract.__init__ is init
+    assert instrument.ACTIVE is None
+
+    stats = prof.stats
+    assert stats["evaluate"][0] == 1
+    assert stats["market_value"][0] >= 8
+    assert stats["decline_option_years"][0] == 1
+    assert stats["breakeven"][0] == 1
+    assert stats["breakeven search"][0] == 1
+    calls, total, self_time, _ = stats["evaluate"]
+    assert 0 < self_time < total
+    assert "evaluate.option_cascade" in prof.summary()
+
+    prof.save_chrome_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == sum(calls for calls, *_ in stats.values())
+    assert {event["ph"] for event in events} == {"X"}
+
+
+def test_phase_is_inert_without_profile():
+    with instrument.phase("unprofiled"):
+        pass
+    assert instrument.ACTIVE is None
+
+
+def test_custom_hooks_and_imported_bindings_are_timed():
+    import compare
+    import value
+
+    # Registering before the first profile keeps the default hooks
+    instrument.DEFAULT_HOOKS.clear()
+    instrument.register_hook(value, "get_model")
+    try:
+        with instrument.profile() as prof:
+            ContractEvaluation(lawrence_contract(), PRODUCTIONS).evaluate()
+        # compare imports market_value by name for the tender solvers
+        with instrument.profile() as tender_prof:
+            compare.find_option_tender_seasons([lawrence_contract()])
+    finally:
+        instrument.HOOKS.clear()
+    assert compare.eval_market_value is value.market_value
+
+    assert prof.stats["value.get_model"][0] >= 1
+    assert prof.stats["evaluate"][0] == 1
+    assert tender_prof.stats["market_value"][0] >= 1
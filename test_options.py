@@ -0,0 +1,44 @@
+import numpy as np
+from pytest import approx
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from options import qbr_grid, tauchen, value_options
+
+
+def test_tauchen_transitions_are_distributions():
+    grid = qbr_grid(step=5.0)
+    transitions = tauchen(grid, [60, 58, 55], persistence=0.7, sigma=8.0)
+    assert transitions.shape == (2, len(grid), len(grid))
+    assert transitions.sum(axis=-1) == approx(np.ones((2, len(grid))))
+
+
+def test_known_production_matches_evaluate():
+    # With production that never changes, the options see a known path
+    grid = qbr_grid()
+    for qbr in (20.0, 80.0):
+        eval_ct = ContractEvaluation(lawrence_contract(), [qbr] * 8)
+        eval_ct.evaluate()
+        valuation = value_options(eval_ct, np.eye(len(grid)), grid)
+        first_option = valuation.years[0]
+        assert valuation.value == approx(
+            sum(
+                contract_season.surplus_value
+                for contract_season in eval_ct.seasons
+                if contract_season.year >= first_option
+            )
+        )
+        is_tendered = qbr > 50
+        assert valuation.is_tendered[:, int(qbr)].tolist() == [is_tendered] * 2
+
+
+def test_options_are_worth_holding():
+    eval_ct = ContractEvaluation(lawrence_contract(), [56, 57, 59, 59, 57, 57, 56, 0])
+    grid = qbr_grid(step=2.0)
+    transitions = tauchen(grid, [57, 56, 55, 54], persistence=0.6, sigma=12.0)
+    valuation = value_options(eval_ct, transitions, grid)
+    assert valuation.option_value >= 0
+    assert valuation.value >= valuation.initial @ valuation.committed_value
+    assert valuation.value >= valuation.decline_value[0]
+    thresholds = valuation.tender_thresholds()
+    assert list(thresholds) == [2029, 2030]
+    assert all(0 <= threshold <= 100 for threshold in thresholds.values())
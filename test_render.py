@@ -0,0 +1,31 @@
+import render
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+
+
+def fake_export_figures(specs):
+    for _, path in specs:
+        with open(path, "w") as f:
+            f.write("png")
+    return [path for _, path in specs]
+
+
+def test_render_skips_unchanged_graphics(tmp_path, monkeypatch):
+    monkeypatch.setattr(render, "export_figures", fake_export_figures)
+    evaluations = []
+    for ix in range(3):
+        eval_ct = ContractEvaluation(
+            lawrence_contract(), [56 + ix, 57, 59, 59, 57, 57, 56, 0], f"QB {ix}"
+        )
+        eval_ct.evaluate()
+        evaluations.append(eval_ct)
+    rendered = render.render_surplus_value_graphics(
+        evaluations, str(tmp_path), max_workers=2, chunk_size=2
+    )
+    assert len(rendered) == 3
+    assert render.render_surplus_value_graphics(evaluations, str(tmp_path)) == []
+
+    evaluations[0].set_productions([80 for _ in range(8)])
+    evaluations[0].evaluate()
+    rendered = render.render_surplus_value_graphics(evaluations, str(tmp_path))
+    assert rendered == [str(tmp_path / "QB 0.png")]
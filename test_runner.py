@@ -0,0 +1,25 @@
+from pytest import approx
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from runner import run
+
+PRODUCTIONS = [56, 57, 59, 59, 57, 57, 56, 0]
+
+
+def test_run_matches_evaluate():
+    entries = [
+        {
+            "player_name": f"QB {ix}",
+            "seasons": lawrence_contract().to_records(),
+            "productions": PRODUCTIONS,
+        }
+        for ix in range(5)
+    ]
+    eval_ct = ContractEvaluation(lawrence_contract(), list(PRODUCTIONS))
+    surplus_value = eval_ct.evaluate()
+    for rows in (run(entries, workers=1), run(entries, workers=2, chunk_size=2)):
+        assert [row["player_name"] for row in rows] == [
+            e["player_name"] for e in entries
+        ]
+        assert rows[0]["surplus_value"] == approx(surplus_value)
+        assert rows[0]["option_years_declined"] == "2029 2030"
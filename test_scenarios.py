@@ -0,0 +1,34 @@
+import numpy as np
+from pytest import approx
+import utils
+from batch import evaluate_contracts
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from scenarios import sweep_contracts
+
+PRODUCTIONS = [[56, 57, 59, 59, 57, 57, 56, 0], [70] * 8, [40] * 8]
+
+
+def test_sweep_matches_single_evaluations(monkeypatch):
+    contracts = [lawrence_contract() for _ in PRODUCTIONS]
+    result = sweep_contracts(
+        contracts,
+        PRODUCTIONS,
+        inflation_rates=[1.0, 1.0858, 1.1],
+        base_years=[2023, 2024],
+        prod_functions=["6_poly", "exp"],
+    )
+    assert result.surplus_value.shape == (3, 12)
+    assert result.evaluation.season_surplus_value.shape == (3, 12, 8)
+    assert result.scenario_index("6_poly") == 3
+    assert np.array_equal(
+        result.surplus_value[:, 3],
+        evaluate_contracts(contracts, PRODUCTIONS).surplus_value,
+    )
+
+    monkeypatch.setattr(utils, "INFLATION_RATE", 1.1)
+    monkeypatch.setattr(utils, "BASE_YEAR", 2023)
+    ix = result.scenario_index("exp", 1.1, 2023)
+    for jx, prods in enumerate(PRODUCTIONS):
+        eval_ct = ContractEvaluation(lawrence_contract(), prods, prod_function="exp")
+        assert result.surplus_value[jx, ix] == approx(eval_ct.evaluate())
@@ -0,0 +1,58 @@
+import numpy as np
+from pytest import approx
+import utils
+from contract import ContractEvaluation
+from contract import Contract
+from sample_contracts import lawrence_contract
+from sensitivity import find_sensitivities, find_sensitivity
+
+LAWRENCE_PRODS = [56, 57, 59, 59, 57, 57, 56, 0]
+PRESCOTT_PRODS = [70, 71, 72, 70, 65]
+
+
+def prescott_contract():
+    return Contract(
+        start_year=2024,
+        end_year=2029,
+        salaries=[43.4, 89.9, 68.0, 62.0, 0.0],
+        option_year=2028,
+        option_salaries=[72.0],
+        option_dead_caps=[34.0],
+    )
+
+
+def surplus_value(contract, prods):
+    return ContractEvaluation(contract(), prods).evaluate()
+
+
+def test_production_sensitivity_matches_finite_differences():
+    result = find_sensitivities(
+        [lawrence_contract(), prescott_contract()], [LAWRENCE_PRODS, PRESCOTT_PRODS]
+    )
+    eps = 1e-5
+    for ix, (contract, prods) in enumerate(
+        [(lawrence_contract, LAWRENCE_PRODS), (prescott_contract, PRESCOTT_PRODS)]
+    ):
+        for jx in range(len(prods)):
+            hi, lo = list(prods), list(prods)
+            hi[jx] += eps
+            lo[jx] -= eps
+            expected = (surplus_value(contract, hi) - surplus_value(contract, lo)) / (
+                2 * eps
+            )
+            assert result.production[ix, jx] == approx(expected, rel=1e-5, abs=1e-6)
+    assert np.isnan(result.production[1, 5:]).all()
+
+
+def test_inflation_sensitivity_matches_finite_differences(monkeypatch):
+    sensitivities = find_sensitivity(
+        ContractEvaluation(lawrence_contract(), LAWRENCE_PRODS)
+    )
+    eps = 1e-6
+    monkeypatch.setattr(utils, "INFLATION_RATE", 1.0858 + eps)
+    hi = surplus_value(lawrence_contract, LAWRENCE_PRODS)
+    monkeypatch.setattr(utils, "INFLATION_RATE", 1.0858 - eps)
+    lo = surplus_value(lawrence_contract, LAWRENCE_PRODS)
+    total = sum(d_rate for _, d_rate in sensitivities.values())
+    assert total == approx((hi - lo) / (2 * eps), rel=1e-5)
+    assert sensitivities[2024][1] == 0.0
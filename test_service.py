@@ -0,0 +1,127 @@
+import asyncio
+import json
+from pytest import approx
+from compare import find_breakeven_point
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from service import EvaluationService, MicroBatcher
+
+PRODUCTIONS = [56, 57, 59, 59, 57, 57, 56, 0]
+
+
+async def request(port: int, method: str, path: str, body=None) -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = b"" if body is None else json.dumps(body).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\n"
+        "Connection: close\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+async def exercise_service() -> dict:
+    service = EvaluationService(port=0, max_batch_size=8, max_latency=0.05)
+    await service.start()
+    try:
+        seasons = lawrence_contract().to_records()
+        evaluations = await asyncio.gather(
+            *(
+                request(
+                    service.port,
+                    "POST",
+                    "/evaluate",
+                    {
+                        "player_name": f"QB {ix}",
+                        "seasons": seasons,
+                        "productions": PRODUCTIONS,
+                    },
+                )
+                for ix in range(20)
+            )
+        )
+        breakeven = await request(
+            service.port, "POST", "/breakeven", {"seasons": seasons}
+        )
+        bad_request = await request(service.port, "POST", "/evaluate", {"seasons": []})
+        bad_model = await request(
+            service.port,
+            "POST",
+            "/evaluate",
+            {"seasons": seasons, "productions": PRODUCTIONS, "prod_function": ["x"]},
+        )
+        health = await request(service.port, "GET", "/health")
+    finally:
+        await service.stop()
+    return {
+        "evaluations": evaluations,
+        "breakeven": breakeven,
+        "bad_request": bad_request,
+        "bad_model": bad_model,
+        "health": health,
+    }
+
+
+def test_service_batches_requests():
+    responses = asyncio.run(exercise_service())
+    surplus_value = ContractEvaluation(lawrence_contract(), PRODUCTIONS).evaluate()
+    for ix, (status, row) in enumerate(responses["evaluations"]):
+        assert status == 200
+        assert row["player_name"] == f"QB {ix}"
+        assert row["surplus_value"] == approx(surplus_value)
+
+    status, breakeven = responses["breakeven"]
+    assert status == 200
+    assert breakeven["breakeven_point"] == approx(
+        find_breakeven_point(lawrence_contract())
+    )
+    assert responses["bad_request"][0] == 400
+    assert responses["bad_model"] == (
+        400,
+        {"error": "'prod_function' must be the name of a value model"},
+    )
+
+    batches = responses["health"][1]["batches"]["/evaluate"]
+    assert batches["requests"] == 20
+    assert batches["batches"] < 20
+
+
+async def exercise_mixed_batch() -> list:
+    service = EvaluationService(port=0, max_batch_size=8, max_latency=0.05)
+    await service.start()
+    try:
+        seasons = lawrence_contract().to_records()
+        bodies = [{"seasons": seasons, "productions": PRODUCTIONS} for _ in range(3)]
+        bodies[1]["productions"] = PRODUCTIONS[:-1] + ["abc"]
+        return await asyncio.gather(
+            *(request(service.port, "POST", "/evaluate", body) for body in bodies)
+        )
+    finally:
+        await service.stop()
+
+
+def test_bad_request_fails_alone():
+    statuses = [status for status, _ in asyncio.run(exercise_mixed_batch())]
+    assert statuses == [200, 400, 200]
+
+
+def test_micro_batcher_isolates_failing_items():
+    def handler(items):
+        return [1 / item for item in items]
+
+    async def submit_all():
+        batcher = MicroBatcher(handler, max_batch_size=8, max_latency=0.05)
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(item) for item in (1, 0, 4)),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    one, zero, four = asyncio.run(submit_all())
+    assert (one, four) == (1.0, 0.25)
+    assert isinstance(zero, ZeroDivisionError)
@@ -0,0 +1,19 @@
+from pytest import approx
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from simulate import simulate_contract, simulate_productions
+
+
+def test_zero_variance_matches_evaluate():
+    eval_ct = ContractEvaluation(lawrence_contract(), [56, 57, 59, 59, 57, 57, 56, 0])
+    result = simulate_contract(eval_ct, n_paths=10)
+    assert result.mean == approx(eval_ct.evaluate())
+    assert result.tender_probabilities() == {2029: 0.0, 2030: 0.0}
+
+
+def test_simulate_productions_correlation():
+    prods = simulate_productions([60, 60], [100, 100], 50000, correlation=0.8, seed=0)
+    assert prods.shape == (50000, 2)
+    assert prods.min() >= 0 and prods.max() <= 100
+    corr = ((prods - 60) * (prods[:, ::-1] - 60)).mean() / 100
+    assert corr == approx(0.8, abs=0.02)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from batch import BatchEvaluation, evaluate_contracts
+from contract import ContractEvaluation
+from sample_contracts import lawrence_contract
+from store import load_evaluations, save_evaluations
+from table import ContractTable
+
+PRODUCTIONS = [[56, 57, 59, 59, 57, 57, 56, 0], [70] * 8, [40] * 6]
+
+
+def contracts():
+    cts = [lawrence_contract() for _ in PRODUCTIONS]
+    cts[2].seasons = cts[2].seasons[:6]
+    return cts
+
+
+def test_table_round_trip_is_memory_mapped(tmp_path):
+    table = ContractTable.from_contracts(contracts())
+    table.save(str(tmp_path / "table"))
+    loaded = ContractTable.load(str(tmp_path / "table"))
+    assert isinstance(
+        np.load(tmp_path / "table" / "salary.npy", mmap_mode="r"), np.memmap
+    )
+    assert np.array_equal(loaded.offsets, table.offsets)
+    for name, col in table.columns.items():
+        assert np.array_equal(
+            loaded.columns[name], col, equal_nan=col.dtype.kind == "f"
+        )
+    assert [ct.to_records() for ct in loaded] == [ct.to_records() for ct in table]
+
+
+def test_table_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    table = ContractTable.from_contracts(contracts())
+    table.save(str(tmp_path / "table.parquet"))
+    loaded = ContractTable.load(str(tmp_path / "table.parquet"))
+    assert [ct.to_records() for ct in loaded] == [ct.to_records() for ct in table]
+
+
+def test_evaluations_round_trip(tmp_path):
+    evaluations = [
+        ContractEvaluation(ct, prods, f"QB {ix}")
+        for ix, (ct, prods) in enumerate(zip(contracts(), PRODUCTIONS))
+    ]
+    save_evaluations(str(tmp_path / "evals"), evaluations)
+    loaded = load_evaluations(str(tmp_path / "evals"))
+    expected = evaluate_contracts(contracts(), PRODUCTIONS)
+    for name in BatchEvaluation.ARRAYS:
+        assert np.array_equal(
+            getattr(loaded.evaluation, name), getattr(expected, name), equal_nan=True
+        )
+    assert loaded.player_names == ["QB 0", "QB 1", "QB 2"]
+    rebuilt = loaded.to_evaluations()
+    assert rebuilt[2].productions == PRODUCTIONS[2]
+    assert rebuilt[0].evaluate() == evaluations[0].evaluate()
+
+
+def test_save_evaluations_requires_one_registered_model(tmp_path):
+    mixed = [
+        ContractEvaluation(lawrence_contract(), PRODUCTIONS[0]),
+        ContractEvaluation(lawrence_contract(), PRODUCTIONS[1], prod_function="exp"),
+    ]
+    with pytest.raises(ValueError, match="share a value model"):
+        save_evaluations(str(tmp_path / "mixed"), mixed)
+    unregistered = [
+        ContractEvaluation(lawrence_contract(), PRODUCTIONS[0], prod_function=abs)
+    ]
+    with pytest.raises(ValueError, match="not registered"):
+        save_evaluations(str(tmp_path / "unregistered"), unregistered)
+    assert not (tmp_path / "mixed").exists()
+
+
+def test_save_evaluations_checks_inputs(tmp_path):
+    with pytest.raises(ValueError, match="No evaluations"):
+        save_evaluations(str(tmp_path / "empty"), [])
+    short = [ContractEvaluation(lawrence_contract(), PRODUCTIONS[0][:6])]
+    with pytest.raises(ValueError, match="6 productions for 8 seasons"):
+        save_evaluations(str(tmp_path / "short"), short)
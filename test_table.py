@@ -0,0 +1,28 @@
+import numpy as np
+from contract import Contract
+from sample_contracts import lawrence_contract
+from batch import pack_contracts
+from table import ContractTable
+
+
+def test_contract_table_round_trip():
+    contracts = [
+        lawrence_contract(),
+        Contract(2024, 2028, [43.4, 89.9, 68.0, 62.0], 2027, [72.0], [34.0], 2030, []),
+    ]
+    table = ContractTable.from_contracts(contracts)
+    assert len(table) == 2
+    for ct, table_ct in zip(contracts, table):
+        assert table_ct.to_records() == ct.to_records()
+        assert table_ct.has_option_years == ct.has_option_years
+        assert table_ct.has_void_years == ct.has_void_years
+        assert table_ct.total_value == ct.total_value
+    assert table[-1].to_records() == contracts[-1].to_records()
+
+
+def test_contract_table_to_batch_matches_pack_contracts():
+    contracts = [lawrence_contract(), lawrence_contract()]
+    contracts[1].seasons = contracts[1].seasons[:5]
+    packed = pack_contracts(contracts)
+    for name, arr in ContractTable.from_contracts(contracts).to_batch().items():
+        np.testing.assert_array_equal(arr, packed[name])
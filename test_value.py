@@ -0,0 +1,59 @@
+import math
+import numpy as np
+import pytest
+from pytest import approx
+import utils
+from value import (
+    market_value,
+    get_derivative,
+    get_model,
+    register_model,
+    PRODUCTION_VALUE_MODELS,
+)
+
+
+def test_registered_models_match_closed_forms():
+    prod = 63.7
+    assert get_model("6_poly")(prod) == approx(
+        0.00000000662 * prod**6
+        - 0.00000186 * prod**5
+        + 0.0001884 * prod**4
+        - 0.00839 * prod**3
+        + 0.1695 * prod**2
+        - 1.15 * prod
+        + 5.05
+    )
+    assert get_model("exp")(prod) == approx(1.631 * math.exp(0.0461 * prod))
+    prods = np.array([40.0, prod])
+    assert get_model("exp")(prods) == approx(1.631 * np.exp(0.0461 * prods))
+    assert market_value(prod, 2026, "pow") == market_value(prod, 2026, get_model("pow"))
+
+
+def test_register_model():
+    model = register_model("linear", "poly", (0.5, 1.0))
+    try:
+        assert get_model("linear")(10.0) == 6.0
+        assert get_model(model) is model.evaluate
+    finally:
+        del PRODUCTION_VALUE_MODELS["linear"]
+    with pytest.raises(KeyError):
+        get_model("linear")
+    with pytest.raises(ValueError):
+        register_model("bad", "spline", ())
+
+
+def test_model_derivatives_match_finite_differences():
+    eps = 1e-5
+    for name, model in PRODUCTION_VALUE_MODELS.items():
+        for prod in (10.0, 55.0, 90.0):
+            expected = (model(prod + eps) - model(prod - eps)) / (2 * eps)
+            assert model.derivative(prod) == approx(expected, rel=1e-6)
+            assert get_derivative(name)(prod) == model.derivative(prod)
+
+
+def test_market_value_reads_utils_constants(monkeypatch):
+    value, inflation_adj = market_value(63.7, 2027)
+    monkeypatch.setattr(utils, "BASE_YEAR", 2025)
+    assert market_value(63.7, 2027)[1] == approx(inflation_adj / utils.INFLATION_RATE)
+    monkeypatch.setattr(utils, "INFLATION_RATE", 1.0)
+    assert market_value(63.7, 2027) == approx((value / inflation_adj, 1.0))
@@ -1,4 +1,6 @@
-import tabulate
+# Yearly growth of the salary cap, and the season values are expressed in
+INFLATION_RATE = 1.0858
+BASE_YEAR = 2024
 
 
 def salary_cousins_actual(season):
@@ -28,6 +30,8 @@ def print_tabular_pts(xs, ys):
 
 
 def print_breakdown(breakdown):
+    import tabulate
+
     if not len(breakdown) > 0:
         return
     headers = breakdown[0].keys()
@@ -35,9 +39,10 @@ def print_breakdown(breakdown):
     print(tabulate.tabulate(rows, headers))
 
 
-def inflation_coeff(season_offset):
+def inflation_coeff(season_offset, inflation_rate=None):
     """Account for salary cap inflation each year after deal is signed"""
-    inflation_rate = 1.0858
+    if inflation_rate is None:
+        inflation_rate = INFLATION_RATE
     return inflation_rate**season_offset
 
 
@@ -1,58 +1,206 @@
+import utils
 from utils import inflation_coeff, salary_cousins_actual, salary_penix_actual
 import math
-from scipy.optimize import minimize
+import numpy as np
 
+SCALAR_TYPES = frozenset((int, float))
 
-def get_apy_prod_value_exp(prod):
-    """Get the raw value in dollars of QBR using exponential model"""
-    value = 1.631 * (math.exp(0.0461 * prod))
-    return value
 
+def polynomial(*coefficients):
+    """Get the Horner form of a polynomial, coefficients highest order first"""
+    if not coefficients:
+        return lambda prod: 0.0 * prod
+    first, rest = coefficients[0], coefficients[1:]
 
-def get_apy_prod_value_pow(prod):
-    """Get the raw value in dollars of QBR using power model"""
-    value = 0.0016 * (prod**2.23796)
-    return value
+    def evaluate(prod):
+        value = first
+        for coefficient in rest:
+            value = value * prod + coefficient
+        return value
 
+    return evaluate
 
-def get_apy_prod_value_3_poly(prod):
-    """Get the raw value in dollars of QBR using 3rd order polynomial model"""
-    x3 = -0.000231 * (prod**3)
-    x2 = 0.0412 * (prod**2)
-    x = -0.997 * prod
-    b = 6.75
-    value = x3 + x2 + x + b
-    return value
 
-
-def get_apy_prod_value_2_poly(prod):
-    """Get the raw value in dollars of QBR using 2nd order polynomial model"""
-    x2 = 0.009 * (prod**2)
-    x = 0.0393 * prod
-    b = -6.2733
-    value = x2 + x + b
-    return value
-
-
-def get_apy_prod_value_6_poly(prod):
-    """Get the raw value in dollars of QBR using 2nd order polynomial model"""
-    x6 = 0.00000000662 * (prod**6)
-    x5 = -0.00000186 * (prod**5)
-    x4 = 0.0001884 * (prod**4)
-    x3 = -0.00839 * (prod**3)
-    x2 = 0.1695 * (prod**2)
-    x = -1.15 * (prod**1)
-    b = 5.05
-    value = x6 + x5 + x4 + x3 + x2 + x + b
-    return value
-
-
-def market_value(prod, season, prod_function=get_apy_prod_value_6_poly):
-    """Get value of production in a given season"""
-    season_offset = season - 2024
+def exponential(a: float, b: float):
+    """Get a * e^(b * prod), using math.exp for scalars and np.exp for arrays"""
+
+    def evaluate(prod):
+        if type(prod) in SCALAR_TYPES:
+            return a * math.exp(b * prod)
+        return a * np.exp(b * prod)
+
+    return evaluate
+
+
+def power(a: float, b: float):
+    """Get a * prod^b"""
+
+    def evaluate(prod):
+        return a * (prod**b)
+
+    return evaluate
+
+
+MODEL_FORMS = {
+    "poly": polynomial,
+    "exp": exponential,
+    "pow": power,
+}
+
+MODEL_DERIVATIVE_FORMS = {
+    "poly": lambda *coefficients: polynomial(
+        *(
+            coefficient * (len(coefficients) - 1 - ix)
+            for ix, coefficient in enumerate(coefficients[:-1])
+        )
+    ),
+    "exp": lambda a, b: exponential(a * b, b),
+    "pow": lambda a, b: power(a * b, b - 1),
+}
+
+
+class ProductionValueModel:
+    """
+    A model of the raw value in dollars of QBR, declared by its form and
+    coefficients and built once into an evaluator that accepts scalars or
+    NumPy arrays.  Polynomial coefficients are given highest order first and
+    evaluated in Horner form.  The derivative with respect to production is
+    built alongside
+    """
+
+    name: str
+    form: str
+    coefficients: tuple
+    description: str = None
+
+    def __init__(
+        self, name: str, form: str, coefficients: tuple, description: str = None
+    ) -> None:
+        if form not in MODEL_FORMS:
+            raise ValueError(f"Unknown production value model form: {form}")
+        self.name = name
+        self.form = form
+        self.coefficients = tuple(coefficients)
+        self.description = description
+        self.evaluate = self.compile()
+        self.derivative = self.compile(MODEL_DERIVATIVE_FORMS)
+
+    def __repr__(self) -> str:
+        return f"ProductionValueModel({self.name}: {self.form})"
+
+    def __call__(self, prod):
+        return self.evaluate(prod)
+
+    def compile(self, forms: dict = MODEL_FORMS):
+        """Build the model, or its derivative forms, into a function of production"""
+        evaluate = forms[self.form](*self.coefficients)
+        evaluate.__name__ = self.name if forms is MODEL_FORMS else f"d_{self.name}"
+        evaluate.__doc__ = self.description
+        return evaluate
+
+
+PRODUCTION_VALUE_MODELS = {}
+
+
+def register_model(
+    name: str, form: str, coefficients: tuple, description: str = None
+) -> ProductionValueModel:
+    """Declare a production value model and make it selectable by name"""
+    model = ProductionValueModel(name, form, coefficients, description)
+    PRODUCTION_VALUE_MODELS[name] = model
+    return model
+
+
+def get_model(prod_function):
+    """
+    Get the production value function for a registered model name, a
+    ProductionValueModel, or a plain function of production
+    """
+    if type(prod_function) is str:
+        if prod_function not in PRODUCTION_VALUE_MODELS:
+            raise KeyError(f"Unknown production value model: {prod_function}")
+        return PRODUCTION_VALUE_MODELS[prod_function].evaluate
+    if isinstance(prod_function, ProductionValueModel):
+        return prod_function.evaluate
+    return prod_function
+
+
+def get_derivative(prod_function, eps: float = 1e-4):
+    """
+    Get the derivative with respect to production of a registered model name,
+    a ProductionValueModel, or a production value function.  Functions that
+    are not registered models are differentiated by central differences
+    """
+    if type(prod_function) is str:
+        if prod_function not in PRODUCTION_VALUE_MODELS:
+            raise KeyError(f"Unknown production value model: {prod_function}")
+        return PRODUCTION_VALUE_MODELS[prod_function].derivative
+    if isinstance(prod_function, ProductionValueModel):
+        return prod_function.derivative
+    for model in PRODUCTION_VALUE_MODELS.values():
+        if model.evaluate is prod_function:
+            return model.derivative
+    return lambda prod: (prod_function(prod + eps) - prod_function(prod - eps)) / (
+        2 * eps
+    )
+
+
+get_apy_prod_value_exp = register_model(
+    "exp",
+    "exp",
+    (1.631, 0.0461),
+    "Get the raw value in dollars of QBR using exponential model",
+).evaluate
+
+get_apy_prod_value_pow = register_model(
+    "pow",
+    "pow",
+    (0.0016, 2.23796),
+    "Get the raw value in dollars of QBR using power model",
+).evaluate
+
+get_apy_prod_value_3_poly = register_model(
+    "3_poly",
+    "poly",
+    (-0.000231, 0.0412, -0.997, 6.75),
+    "Get the raw value in dollars of QBR using 3rd order polynomial model",
+).evaluate
+
+get_apy_prod_value_2_poly = register_model(
+    "2_poly",
+    "poly",
+    (0.009, 0.0393, -6.2733),
+    "Get the raw value in dollars of QBR using 2nd order polynomial model",
+).evaluate
+
+get_apy_prod_value_6_poly = register_model(
+    "6_poly",
+    "poly",
+    (0.00000000662, -0.00000186, 0.0001884, -0.00839, 0.1695, -1.15, 5.05),
+    "Get the raw value in dollars of QBR using 6th order polynomial model",
+).evaluate
+
+
+def market_value(
+    prod,
+    season,
+    prod_function=get_apy_prod_value_6_poly,
+    base_year=None,
+    inflation_rate=None,
+):
+    """
+    Get value of production in a given season.  prod_function may be any
+    function of production or the name of a registered model.  Values are
+    inflated from base_year at inflation_rate, by default
+    utils.BASE_YEAR and utils.INFLATION_RATE; both may be arrays that
+    broadcast against season
+    """
+    if type(prod_function) is str:
+        prod_function = get_model(prod_function)
+    season_offset = season - (utils.BASE_YEAR if base_year is None else base_year)
     # Lower bound for starting QB is ~40 QBR.  Anything lower is worse than replacement
     raw_prod_value = prod_function(prod)  # if prod >= 40.0 else 8
-    inflation_adj = inflation_coeff(season_offset)
+    inflation_adj = inflation_coeff(season_offset, inflation_rate)
     production_value = raw_prod_value * inflation_adj
     return production_value, inflation_adj
 